@@ -0,0 +1,199 @@
+"""Persistent local caches for Bitquery data.
+
+QuestionInitialized events (and their ancillaryData) never change once
+emitted, so they are stored in a small SQLite database and looked up locally
+instead of walking Bitquery's archive on every call. ``ResultCache`` keeps
+derived CLI results (question details, market prices) with a per-entry TTL.
+"""
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from config import Config
+
+try:  # cached responses can hold thousands of events; orjson round-trips them faster
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def _dumps(value: Any) -> str:
+    if orjson is not None:
+        return orjson.dumps(value).decode("utf-8")
+    return json.dumps(value)
+
+
+def _loads(value: str) -> Any:
+    if orjson is not None:
+        return orjson.loads(value)
+    return json.loads(value)
+
+
+def _normalize_id(value: Any) -> str:
+    return str(value).strip().lower().removeprefix("0x")
+
+
+def _block_timestamp(event: Dict) -> Optional[int]:
+    value = (event.get("Block") or {}).get("Time")
+    if not value:
+        return None
+    try:
+        return int(datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp())
+    except ValueError:
+        return None
+
+
+def _argument_value(event: Dict, *names: str) -> Optional[str]:
+    for argument in event.get("Arguments") or []:
+        if argument.get("Name") in names:
+            value = argument.get("Value") or {}
+            return value.get("hex") or value.get("string")
+    return None
+
+
+class _SQLiteStore:
+    """Lazily opened SQLite database under ``Config.CACHE_DIR``.
+
+    If the database cannot be created (e.g. a read-only home directory) the
+    store silently stays empty and callers fall through to Bitquery.
+    """
+
+    _SCHEMA = ""
+    _FILENAME = ""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else Config.CACHE_DIR / self._FILENAME
+        self._connection: Optional[sqlite3.Connection] = None
+        self._disabled = False
+        self._lock = threading.Lock()
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if self._connection is None and not self._disabled:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                connection = sqlite3.connect(self.path, check_same_thread=False)
+                connection.execute(self._SCHEMA)
+                connection.commit()
+                self._connection = connection
+            except (OSError, sqlite3.Error) as e:
+                print(f"Cache unavailable ({self.path}): {e}")
+                self._disabled = True
+        return self._connection
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+class QuestionIndex(_SQLiteStore):
+    """SQLite-backed ``question_id -> QuestionInitialized event`` index."""
+
+    _FILENAME = "questions.db"
+    _SCHEMA = """
+    CREATE TABLE IF NOT EXISTS questions (
+        question_id TEXT PRIMARY KEY,
+        condition_id TEXT,
+        ancillary_data BLOB,
+        block_time INTEGER,
+        event TEXT NOT NULL
+    )
+    """
+
+    def get(self, question_id: str) -> Optional[Dict]:
+        """Return the stored QuestionInitialized event for ``question_id``."""
+        with self._lock:
+            connection = self._connect()
+            if connection is None:
+                return None
+            row = connection.execute(
+                "SELECT event FROM questions WHERE question_id = ?",
+                (_normalize_id(question_id),),
+            ).fetchone()
+        return _loads(row[0]) if row else None
+
+    def add_events(self, events: Iterable[Dict]) -> int:
+        """Store QuestionInitialized events; returns the number of rows written."""
+        rows = []
+        for event in events or []:
+            question_id = _argument_value(event, "questionID", "questionId")
+            ancillary_data = _argument_value(event, "ancillaryData")
+            if not question_id or not ancillary_data:
+                continue
+            condition_id = _argument_value(event, "conditionId")
+            rows.append((
+                _normalize_id(question_id),
+                _normalize_id(condition_id) if condition_id else None,
+                ancillary_data,
+                _block_timestamp(event),
+                _dumps(event),
+            ))
+        if not rows:
+            return 0
+        with self._lock:
+            connection = self._connect()
+            if connection is None:
+                return 0
+            with connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO questions "
+                    "(question_id, condition_id, ancillary_data, block_time, event) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+        return len(rows)
+
+
+class ResultCache(_SQLiteStore):
+    """Persistent ``key -> JSON value`` cache with a per-entry TTL."""
+
+    _FILENAME = "results.db"
+    _SCHEMA = """
+    CREATE TABLE IF NOT EXISTS results (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL,
+        expires_at REAL NOT NULL
+    )
+    """
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        opening = self._connection is None
+        connection = super()._connect()
+        if opening and connection is not None:
+            # Expired rows are never read again; drop them once per process
+            # so the file does not grow with every command run
+            try:
+                with connection:
+                    connection.execute("DELETE FROM results WHERE expires_at <= ?", (time.time(),))
+            except sqlite3.Error:
+                pass
+        return connection
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for ``key``, or None if missing or expired."""
+        with self._lock:
+            connection = self._connect()
+            if connection is None:
+                return None
+            row = connection.execute(
+                "SELECT value FROM results WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            ).fetchone()
+        return _loads(row[0]) if row else None
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """Store ``value`` under ``key`` for ``ttl`` seconds."""
+        with self._lock:
+            connection = self._connect()
+            if connection is None:
+                return
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO results (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, _dumps(value), time.time() + ttl),
+                )
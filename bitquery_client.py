@@ -1,35 +1,880 @@
 """Bitquery GraphQL client for querying Polymarket CTF Exchange events."""
+import functools
+import hashlib
+import inspect
+import json
+import re
+import sys
+import threading
+import time
 import requests
-from typing import Dict, List, Optional
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+from bitquery_cache import QuestionIndex, ResultCache
 from config import Config
 
+try:  # orjson parses large event payloads 2-3x faster than the stdlib
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:  # ijson lets large responses be consumed one event at a time
+    import ijson
+except ImportError:  # pragma: no cover - optional speedup
+    ijson = None
+
+
+@functools.lru_cache(maxsize=8192)
+def _norm_addr(address: str) -> str:
+    """Lowercase an address once; repeat calls return the same interned string."""
+    return sys.intern(address.strip().lower())
+
+
+@functools.lru_cache(maxsize=8192)
+def _norm_hex(value: Any) -> str:
+    """Normalize an ID (hex or decimal) to lowercase without ``0x``, interned."""
+    return sys.intern(str(value).strip().lower().removeprefix("0x"))
+
+
+class _TTLCache:
+    """Small thread-safe LRU cache whose entries expire after ``ttl`` seconds."""
+
+    def __init__(self, maxsize: int = 4096, ttl: float = 3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Any) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Any, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+# TokenRegistered / QuestionInitialized events are immutable once indexed, so
+# ID lookups are memoized process-wide, shared by every client instance.
+_LOOKUP_CACHE = _TTLCache(maxsize=4096, ttl=3600)
+
+# Lookups currently being fetched, so concurrent callers asking for the same
+# key (e.g. many trades on one market under gather_many) share one request.
+_INFLIGHT: Dict[Any, Future] = {}
+_INFLIGHT_LOCK = threading.Lock()
+
+
+def _cached_lookup(method: Callable) -> Callable:
+    """Memoize a ``get_*_by_*_id(identifier, limit, since_days)`` query method.
+
+    Keys use the normalized identifier (no ``0x``, lowercase) so equivalent
+    spellings share one entry. Empty results are not cached, since they may
+    also mean a transient API error. Concurrent misses for the same key wait
+    on the first caller's request instead of issuing their own. A ``fresh``
+    client always queries.
+    """
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs) -> List[Dict]:
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        identifier, *params = list(bound.arguments.values())[1:]
+        if self.fresh:
+            return method(*bound.args, **bound.kwargs)
+        normalized = _norm_hex(identifier)
+        key = (method.__name__, normalized, *params)
+        cached = _LOOKUP_CACHE.get(key)
+        if cached is not None:
+            return cached
+
+        with _INFLIGHT_LOCK:
+            future = _INFLIGHT.get(key)
+            owner = future is None
+            if owner:
+                future = _INFLIGHT[key] = Future()
+        if not owner:
+            return future.result()
+
+        try:
+            events = method(*bound.args, **bound.kwargs)
+            if events:
+                _LOOKUP_CACHE.set(key, events)
+            future.set_result(events)
+            return events
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with _INFLIGHT_LOCK:
+                _INFLIGHT.pop(key, None)
+    return wrapper
+
+
+
+
+# ---------------------------------------------------------------------------
+# GraphQL documents
+#
+# Queries are static documents: per-call values travel in ``variables`` so the
+# document text is identical across calls, built once per operation/filter
+# combination by ``_query`` and cached.
+# ---------------------------------------------------------------------------
+
+_BLOCK_AND_TRANSACTION = """
+      Block {
+        Time
+        Number
+        Hash
+      }
+      Transaction {
+        Hash
+        From
+        To
+      }"""
+
+_TRANSACTION_STATUS = """
+      TransactionStatus {
+        Success
+      }"""
+
+_ALL_ARGUMENT_VALUES = """
+      Arguments {
+        Name
+        Value {
+          ... on EVM_ABI_Integer_Value_Arg {
+            integer
+          }
+          ... on EVM_ABI_Address_Value_Arg {
+            address
+          }
+          ... on EVM_ABI_String_Value_Arg {
+            string
+          }
+          ... on EVM_ABI_BigInt_Value_Arg {
+            bigInteger
+          }
+          ... on EVM_ABI_Bytes_Value_Arg {
+            hex
+          }
+          ... on EVM_ABI_Boolean_Value_Arg {
+            bool
+          }
+        }
+      }"""
+
+_VALUE_BRANCHES: Dict[str, Tuple[str, str]] = {
+    "integer": ("EVM_ABI_Integer_Value_Arg", "integer"),
+    "address": ("EVM_ABI_Address_Value_Arg", "address"),
+    "string": ("EVM_ABI_String_Value_Arg", "string"),
+    "bigInteger": ("EVM_ABI_BigInt_Value_Arg", "bigInteger"),
+    "hex": ("EVM_ABI_Bytes_Value_Arg", "hex"),
+    "bool": ("EVM_ABI_Boolean_Value_Arg", "bool"),
+}
+
+
+def _argument_values(*branches: str) -> str:
+    """Return an ``Arguments`` selection with only the given value branches.
+
+    Each branch names an entry of ``_VALUE_BRANCHES``; unused union branches
+    are left out so the server resolves less and the response carries fewer
+    keys.
+    """
+    members = "".join(
+        """
+          ... on %s {
+            %s
+          }""" % _VALUE_BRANCHES[branch]
+        for branch in branches
+    )
+    return """
+      Arguments {
+        Name
+        Value {%s
+        }
+      }""" % members
+
+
+# TokenRegistered(uint256 token0, uint256 token1, bytes32 conditionId)
+_TOKEN_ARGUMENT_VALUES = _argument_values("bigInteger", "hex")
+# ConditionPreparation / QuestionInitialized IDs are bytes32
+_ID_ARGUMENT_VALUES = _argument_values("hex")
+# QuestionInitialized ancillaryData may come back decoded as a string
+_QUESTION_ARGUMENT_VALUES = _argument_values("hex", "string")
+
+_EXCHANGE_FILTER = """
+        Log: {Signature: {Name: {in: ["OrderFilled"]}}},
+        LogHeader: {
+          Address: {
+            in: [
+              "%(CTF_EXCHANGE_ADDRESS)s",
+              "%(LEGACY_EXCHANGE_ADDRESS)s"
+            ]
+          }
+        }"""
+
+# operation -> (dataset, variable declarations, where clauses, selection set)
+_QUERY_SPECS: Dict[str, Tuple[str, Tuple[str, ...], str, str]] = {
+    "OrderFilledEvents": (
+        "%(DATASET)s",
+        ("$limit: Int!",),
+        _EXCHANGE_FILTER,
+        _BLOCK_AND_TRANSACTION + _ALL_ARGUMENT_VALUES,
+    ),
+    "OrderFilledEventsByAsset": (
+        "%(DATASET)s",
+        ("$asset_id: String!", "$limit: Int!"),
+        """
+        Arguments: {
+          includes: {
+            Value: {
+              BigInteger: {
+                eq: $asset_id
+              }
+            }
+          }
+        },""" + _EXCHANGE_FILTER,
+        _BLOCK_AND_TRANSACTION + _ALL_ARGUMENT_VALUES,
+    ),
+    "OrderFilledEventsByAssets": (
+        "%(DATASET)s",
+        ("$asset_ids: [String!]!", "$limit: Int!"),
+        """
+        Arguments: {
+          includes: {
+            Value: {
+              BigInteger: {
+                in: $asset_ids
+              }
+            }
+          }
+        },""" + _EXCHANGE_FILTER,
+        _BLOCK_AND_TRANSACTION + _ALL_ARGUMENT_VALUES,
+    ),
+    "OrderFilledEventsByTrader": (
+        "%(DATASET)s",
+        ("$trader: String!", "$limit: Int!"),
+        """
+        Arguments: {
+          includes: {
+            Name: {
+              in: ["maker", "taker"]
+            },
+            Value: {
+              Address: {
+                is: $trader
+              }
+            }
+          }
+        },""" + _EXCHANGE_FILTER,
+        _BLOCK_AND_TRANSACTION + _ALL_ARGUMENT_VALUES,
+    ),
+    "OrderFilledEventsByAssetAndTrader": (
+        "%(DATASET)s",
+        ("$asset_id: String!", "$trader: String!", "$limit: Int!"),
+        """
+        Arguments: {
+          includes: [
+            {
+              Value: {
+                BigInteger: {
+                  eq: $asset_id
+                }
+              }
+            },
+            {
+              Name: {
+                in: ["maker", "taker"]
+              },
+              Value: {
+                Address: {
+                  is: $trader
+                }
+              }
+            }
+          ]
+        },""" + _EXCHANGE_FILTER,
+        _BLOCK_AND_TRANSACTION + _ALL_ARGUMENT_VALUES,
+    ),
+    "OrderFilledEventsByAssetsAndTrader": (
+        "%(DATASET)s",
+        ("$asset_ids: [String!]!", "$trader: String!", "$limit: Int!"),
+        """
+        Arguments: {
+          includes: [
+            {
+              Value: {
+                BigInteger: {
+                  in: $asset_ids
+                }
+              }
+            },
+            {
+              Name: {
+                in: ["maker", "taker"]
+              },
+              Value: {
+                Address: {
+                  is: $trader
+                }
+              }
+            }
+          ]
+        },""" + _EXCHANGE_FILTER,
+        _BLOCK_AND_TRANSACTION + _ALL_ARGUMENT_VALUES,
+    ),
+    "OrderFilledEventsByMaker": (
+        "%(DATASET)s",
+        ("$maker: String!", "$limit: Int!"),
+        """
+        Arguments: {
+          includes: {
+            Name: {
+              is: "maker"
+            },
+            Value: {
+              Address: {
+                is: $maker
+              }
+            }
+          }
+        },""" + _EXCHANGE_FILTER,
+        _BLOCK_AND_TRANSACTION + _ALL_ARGUMENT_VALUES,
+    ),
+    "TokenRegisteredEvents": (
+        "combined",
+        ("$limit: Int!", "$since_days: Int!"),
+        """
+        Block: {Time: {since_relative: {days_ago: $since_days}}},
+        Log: {Signature: {Name: {in: ["TokenRegistered"]}}},
+        LogHeader: {Address: {is: "%(LEGACY_EXCHANGE_ADDRESS)s"}}""",
+        """
+      Block {
+        Time
+        Number
+      }
+      Transaction {
+        Hash
+        From
+      }
+      Arguments {
+        Name
+        Value {
+          ... on EVM_ABI_BigInt_Value_Arg {
+            bigInteger
+          }
+          ... on EVM_ABI_Bytes_Value_Arg {
+            hex
+          }
+        }
+      }""",
+    ),
+    "OrdersMatchedEvents": (
+        "%(DATASET)s",
+        ("$limit: Int!",),
+        """
+        Log: {Signature: {Name: {in: ["OrdersMatched"]}}},
+        LogHeader: {Address: {is: "%(CTF_EXCHANGE_ADDRESS)s"}}""",
+        _BLOCK_AND_TRANSACTION + """
+      Arguments {
+        Name
+        Value {
+          ... on EVM_ABI_Integer_Value_Arg {
+            integer
+          }
+          ... on EVM_ABI_BigInt_Value_Arg {
+            bigInteger
+          }
+          ... on EVM_ABI_Address_Value_Arg {
+            address
+          }
+        }
+      }""",
+    ),
+    "TokenRegisteredByAsset": (
+        "archive",
+        ("$asset_id: String!", "$limit: Int!", "$since_days: Int!"),
+        """
+        Arguments: {
+          includes: {
+            Value: {
+              String: {
+                includesCaseInsensitive: $asset_id
+              }
+            }
+          }
+        },
+        Log: {
+          Signature: {
+            Name: {
+              includesCaseInsensitive: "tokenregistered"
+            }
+          }
+        },
+        Block: {
+          Time: {
+            since_relative: {
+              days_ago: $since_days
+            }
+          }
+        }""",
+        _BLOCK_AND_TRANSACTION + _TRANSACTION_STATUS + _TOKEN_ARGUMENT_VALUES + """
+      Log {
+        SmartContract
+        Signature {
+          Name
+        }
+      }""",
+    ),
+    "QuestionEventsByCondition": (
+        "archive",
+        ("$condition_id: String!", "$limit: Int!", "$since_days: Int!"),
+        """
+        Block: {
+          Time: {
+            since_relative: {
+              days_ago: $since_days
+            }
+          }
+        },
+        Arguments: {
+          includes: {
+            Name: {
+              in: ["questionID", "conditionId"]
+            },
+            Value: {
+              Bytes: {
+                is: $condition_id
+              }
+            }
+          }
+        },
+        Log: {
+          Signature: {
+            Name: {
+              in: ["QuestionInitialized", "ConditionPreparation"]
+            }
+          }
+        },
+        LogHeader: {
+          Address: {
+            in: [
+              "0x4d97dcd97ec945f40cf65f87097ace5ea0476045",
+              "0x65070BE91477460D8A7AeEb94ef92fe056C2f2A7"
+            ]
+          }
+        }""",
+        _BLOCK_AND_TRANSACTION + _TRANSACTION_STATUS + _ID_ARGUMENT_VALUES,
+    ),
+    "QuestionDataByQuestion": (
+        "archive",
+        ("$question_id: String!", "$limit: Int!", "$since_days: Int!"),
+        """
+        Block: {
+          Time: {
+            since_relative: {
+              days_ago: $since_days
+            }
+          }
+        },
+        Arguments: {
+          includes: {
+            Name: {
+              in: ["questionID"]
+            },
+            Value: {
+              Bytes: {
+                is: $question_id
+              }
+            }
+          }
+        },
+        Log: {
+          Signature: {
+            Name: {
+              in: ["QuestionInitialized"]
+            }
+          }
+        },
+        LogHeader: {
+          Address: {
+            in: ["0x65070BE91477460D8A7AeEb94ef92fe056C2f2A7"]
+          }
+        }""",
+        _BLOCK_AND_TRANSACTION + _TRANSACTION_STATUS + _QUESTION_ARGUMENT_VALUES,
+    ),
+    "RecentQuestionInitialized": (
+        "%(DATASET)s",
+        ("$limit: Int!",),
+        """
+        Log: {Signature: {Name: {in: ["QuestionInitialized"]}}},
+        LogHeader: {
+          Address: {
+            is: "%(QUESTION_CONTRACT_ADDRESS)s"
+          }
+        }""",
+        _BLOCK_AND_TRANSACTION + _TRANSACTION_STATUS + _QUESTION_ARGUMENT_VALUES,
+    ),
+}
+
+# Optional conditions on the Block input: name -> (variable declaration,
+# condition); a where object may hold only one Block key, so these are merged
+_BLOCK_FILTERS: Dict[str, Tuple[str, str]] = {
+    "since_hours": ("$since_hours: Int!", "Time: {since_relative: {hours_ago: $since_hours}}"),
+    "before_block": ("$before_block: Int!", "Number: {lt: $before_block}"),
+}
+
+# Other optional where clauses: name -> (variable declaration, clause)
+_OPTIONAL_FILTERS: Dict[str, Tuple[str, str]] = {
+    # Not a where clause: skips the first $offset rows (see _EVENTS_FIELD)
+    "offset": ("$offset: Int!", ""),
+    "condition_id": (
+        "$condition_id: String!",
+        """
+        Arguments: {
+          includes: {
+            Name: {is: "conditionId"},
+            Value: {Bytes: {is: $condition_id}}
+          }
+        },""",
+    ),
+}
+
+_EVENTS_FIELD = """
+    %(alias)sEvents(
+      orderBy: {descending: Block_Time}
+      where: {%(where)s
+      }
+      limit: {count: $limit%(offset)s}
+    ) {%(selection)s
+    }"""
+
+_DOCUMENT = """query %(operation)s(%(variables)s) {
+  EVM(dataset: %(dataset)s, network: %(network)s) {%(fields)s
+  }
+}"""
+
+
+class _ConfigValues(dict):
+    """Mapping that resolves ``%(NAME)s`` placeholders from ``Config`` on demand."""
+
+    def __missing__(self, key: str) -> Any:
+        return getattr(Config, key)
+
+
+def _offset(filters: Tuple[str, ...]) -> str:
+    return ", offset: $offset" if "offset" in filters else ""
+
+
+def _filter_clauses(filters: Tuple[str, ...], declarations: List[str]) -> str:
+    """Return the where clauses for ``filters``, adding their declarations."""
+    block_conditions = []
+    clauses = ""
+    for name in filters:
+        if name in _BLOCK_FILTERS:
+            declaration, condition = _BLOCK_FILTERS[name]
+            block_conditions.append(condition)
+        else:
+            declaration, clause = _OPTIONAL_FILTERS[name]
+            clauses += clause
+        if declaration not in declarations:
+            declarations.append(declaration)
+    if block_conditions:
+        clauses = "\n        Block: {%s}," % ", ".join(block_conditions) + clauses
+    return clauses
+
+
+@functools.lru_cache(maxsize=None)
+def _query(operation: str, *filters: str) -> str:
+    """Return the GraphQL document for ``operation`` with optional ``filters``.
+
+    The document depends only on its arguments, so each variant is built
+    once per process and reused for every call.
+    """
+    dataset, declarations, where, selection = _QUERY_SPECS[operation]
+    variables = list(declarations)
+    clauses = _filter_clauses(filters, variables)
+    field = _EVENTS_FIELD % {
+        "alias": "",
+        "where": clauses + where,
+        "offset": _offset(filters),
+        "selection": selection,
+    }
+    document = (_DOCUMENT % {
+        "operation": operation,
+        "variables": ", ".join(variables),
+        "dataset": dataset,
+        "network": "%(NETWORK)s",
+        "fields": field,
+    }) % _ConfigValues()
+    _DOCUMENT_TTLS[document] = _operation_ttl(operation)
+    return document
+
+
+_ROOT_FIELD = """
+  %(alias)s: EVM(dataset: %(dataset)s, network: %(network)s) {%(fields)s
+  }"""
+
+_VARIABLE_PATTERN = re.compile(r"\$(\w+)")
+
+
+@functools.lru_cache(maxsize=None)
+def _multi_query(parts: Tuple[Tuple[str, Tuple[str, ...]], ...]) -> str:
+    """Return one document running several ``(operation, filters)`` queries.
+
+    Each query gets its own aliased ``EVM`` root (``q0``, ``q1``, ...), so
+    operations on different datasets can share a request; every variable is
+    suffixed with its alias index (``$limit_0``, ``$asset_id_1``, ...).
+    """
+    variables: List[str] = []
+    roots = []
+    for index, (operation, filters) in enumerate(parts):
+        dataset, declarations, where, selection = _QUERY_SPECS[operation]
+        declarations = list(declarations)
+        clauses = _filter_clauses(filters, declarations)
+        suffix = rf"$\g<1>_{index}"
+        field = _EVENTS_FIELD % {
+            "alias": "",
+            "where": clauses + where,
+            "offset": _offset(filters),
+            "selection": selection,
+        }
+        variables += [_VARIABLE_PATTERN.sub(suffix, d) for d in declarations]
+        roots.append(_ROOT_FIELD % {
+            "alias": f"q{index}",
+            "dataset": dataset,
+            "network": "%(NETWORK)s",
+            "fields": _VARIABLE_PATTERN.sub(suffix, field),
+        })
+    document = (
+        "query Batch(%s) {%s\n}" % (", ".join(variables), "".join(roots))
+    ) % _ConfigValues()
+    _DOCUMENT_TTLS[document] = min(_operation_ttl(operation) for operation, _ in parts)
+    return document
+
+
+# How long a cached response stays valid, by operation name prefix: fills
+# move prices within seconds, "newest" lists grow, and the registration and
+# question lookups for a given asset or condition never change
+_RESPONSE_TTLS = (
+    ("OrderFilled", 10),
+    ("OrdersMatched", 10),
+    ("RecentQuestionInitialized", 60),
+    ("TokenRegisteredEvents", 60),
+    ("TokenRegisteredByAsset", 60 * 60 * 24),
+    ("QuestionEventsByCondition", 60 * 60 * 24),
+    ("QuestionDataByQuestion", 60 * 60 * 24),
+)
+_DEFAULT_RESPONSE_TTL = 30
+
+# Built document -> TTL of its most volatile operation, filled in by the
+# query builders (a batched document no longer names its operations)
+_DOCUMENT_TTLS: Dict[str, int] = {}
+
+
+def _operation_ttl(operation: str) -> int:
+    return next((ttl for prefix, ttl in _RESPONSE_TTLS if operation.startswith(prefix)), _DEFAULT_RESPONSE_TTL)
+
+
+def _response_ttl(query: str) -> int:
+    return _DOCUMENT_TTLS.get(query, _DEFAULT_RESPONSE_TTL)
+
+
+def _response_key(query: str, variables: Optional[Dict]) -> str:
+    digest = hashlib.sha1(query.encode("utf-8"))
+    digest.update(json.dumps(variables or {}, sort_keys=True, default=str).encode("utf-8"))
+    return f"response:{digest.hexdigest()}"
+
+
+def _print_errors(errors: List[Dict]) -> None:
+    error_messages = [err.get("message", "Unknown error") for err in errors]
+    print(f"GraphQL errors: {', '.join(error_messages)}")
+
+
 class BitqueryClient:
     """Client for querying Bitquery GraphQL API."""
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        question_index: Optional[QuestionIndex] = None,
+        response_cache: Optional[ResultCache] = None,
+        fresh: bool = False
+    ):
         self.api_key = api_key or Config.OAUTH_TOKEN
+        self.question_index = question_index or QuestionIndex()
+        # Query Bitquery for every ID lookup instead of answering from the
+        # lookup cache or the question index (which are still filled)
+        self.fresh = fresh
+        # Optional short-lived cache of whole responses, so repeating a
+        # command within seconds skips the network (owned by the caller)
+        self.response_cache = response_cache
         self.api_url = Config.BITQUERY_API_URL
         self.headers = {
-            "Content-Type": "application/json"
+            "Content-Type": "application/json",
+            # Event payloads are mostly repeated field names and compress
+            # ~10x; urllib3 lists only the encodings it can decode (br when
+            # brotli is installed, zstd when zstandard is)
+            "Accept-Encoding": ACCEPT_ENCODING,
         }
         if self.api_key:
             self.headers["Authorization"] = f"Bearer {self.api_key}"
+
+        # One pooled keep-alive session per client so repeated queries skip
+        # the TCP+TLS handshake. GraphQL reads are idempotent, so POST is retried.
+        retry = Retry(
+            total=2,
+            backoff_factor=0.3,
+            status_forcelist=[429, 502, 503, 504],
+            allowed_methods=None,
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.headers.update(self.headers)
+
+        # Opt-in HTTP/2: concurrent queries share one multiplexed connection.
+        # Requires httpx with the h2 extra; falls back to the session otherwise.
+        # httpx is only imported when enabled, as it is slow to import.
+        self.http2_client = None
+        if Config.BITQUERY_HTTP2:
+            try:
+                import httpx
+                limits = httpx.Limits(max_connections=10, max_keepalive_connections=10)
+                self.http2_client = httpx.Client(
+                    transport=httpx.HTTPTransport(http2=True, retries=2, limits=limits),
+                    # httpx negotiates the encodings it can decode itself
+                    headers={k: v for k, v in self.headers.items() if k != "Accept-Encoding"},
+                    timeout=httpx.Timeout(30.0, connect=5.0),
+                )
+            except ImportError as e:
+                print(f"HTTP/2 unavailable, using HTTP/1.1: {e}")
+
+    def close(self) -> None:
+        """Release pooled connections and the local question index."""
+        self.session.close()
+        if self.http2_client is not None:
+            self.http2_client.close()
+        self.question_index.close()
+
+    def gather_many(self, *calls: Callable[[], Any], max_workers: int = 8) -> List[Any]:
+        """Run independent query calls concurrently and return their results in order.
+
+        Each call is a zero-argument callable, e.g.
+        ``functools.partial(client.get_order_filled_events_by_asset_id, asset_id)``.
+        The queries are I/O bound, so a small thread pool sharing the pooled
+        session completes N requests in roughly the time of the slowest one.
+        """
+        if not calls:
+            return []
+        if len(calls) == 1:
+            return [calls[0]()]
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(calls))) as executor:
+            futures = [executor.submit(call) for call in calls]
+            return [future.result() for future in futures]
     
     def _execute_query(self, query: str, variables: Optional[Dict] = None) -> Dict:
-        """Execute a GraphQL query with a sane default timeout."""
+        """Execute a GraphQL query, answering from ``response_cache`` when possible."""
+        if self.response_cache is None:
+            return self._post_query(query, variables)
+        
+        key = _response_key(query, variables)
+        result = self.response_cache.get(key)
+        if result is None:
+            result = self._post_query(query, variables)
+            if "errors" not in result:
+                self.response_cache.set(key, result, _response_ttl(query))
+        return result
+    
+    def _post_query(self, query: str, variables: Optional[Dict] = None) -> Dict:
+        """POST a GraphQL query with split connect/read timeouts."""
         payload = {"query": query}
         if variables:
             payload["variables"] = variables
-        
-        response = requests.post(
-            self.api_url,
-            json=payload,
-            headers=self.headers,
-            timeout=30,
-        )
+
+        if orjson is not None:
+            payload_bytes = orjson.dumps(payload)
+        else:
+            payload_bytes = json.dumps(payload).encode("utf-8")
+
+        if self.http2_client is not None:
+            response = self.http2_client.post(self.api_url, content=payload_bytes)
+        else:
+            response = self.session.post(
+                self.api_url,
+                data=payload_bytes,
+                timeout=(5, 30),
+            )
         response.raise_for_status()
+        if orjson is not None:
+            return orjson.loads(response.content)
         return response.json()
     
+    @staticmethod
+    def _extract_events(result: Dict) -> List[Dict]:
+        """Return ``data.EVM.Events`` from a response, or [] on errors or a malformed body."""
+        if "errors" in result:
+            _print_errors(result["errors"])
+            return []
+        try:
+            events = result["data"]["EVM"]["Events"]
+        except (KeyError, TypeError):
+            return []
+        return events if isinstance(events, list) else []
+    
+    def batch(self, *requests: Tuple[str, Dict[str, Any]]) -> List[Optional[List[Dict]]]:
+        """Run several queries in one POST and return each one's events, in order.
+        
+        Each request is ``(operation, variables)`` with the same variables the
+        single-query method would send; optional filters such as
+        ``since_hours`` are enabled by their presence in ``variables``. The
+        queries may target different datasets. If the request fails every
+        entry is None (not ``[]``), so callers can tell a failure from an
+        empty result and fall back to the single-query methods.
+        """
+        parts = []
+        variables: Dict[str, Any] = {}
+        for index, (operation, request_variables) in enumerate(requests):
+            declared = _QUERY_SPECS[operation][1]
+            filters = tuple(
+                name for name in (*_BLOCK_FILTERS, *_OPTIONAL_FILTERS)
+                if name in request_variables and not any(d.startswith(f"${name}:") for d in declared)
+            )
+            parts.append((operation, filters))
+            variables.update({f"{name}_{index}": value for name, value in request_variables.items()})
+        
+        failed: List[Optional[List[Dict]]] = [None] * len(requests)
+        try:
+            result = self._execute_query(_multi_query(tuple(parts)), variables)
+        except Exception as e:
+            print(f"Error fetching batched queries: {e}")
+            return failed
+        if "errors" in result:
+            _print_errors(result["errors"])
+            return failed
+        
+        data = result.get("data") or {}
+        return [
+            self._extract_events({"data": {"EVM": data.get(f"q{index}")}})
+            for index in range(len(requests))
+        ]
+    
     def get_order_filled_events(
         self,
         limit: int = 20,
@@ -37,94 +882,36 @@ class BitqueryClient:
         trader_address: Optional[str] = None,
         since_hours: Optional[int] = None
     ) -> List[Dict]:
-        """Query OrderFilled events from CTF Exchange."""
-        # Note: We don't filter by asset_ids or trader_address in the query because
-        # these values are in the event arguments (makerAssetId/takerAssetId for assets,
-        # maker/taker for traders), not in easily queryable fields.
-        # Filtering will be done in Python after parsing the events.
-        # We fetch more events to account for filtering.
+        """Query OrderFilled events from CTF Exchange.
+        
+        Asset and trader filters are applied server-side via
+        ``Arguments.includes``; when both are given an event must match both.
+        """
+        if trader_address and not asset_ids:
+            return self.get_order_filled_events_by_trader(
+                trader_address, limit=limit, since_hours=since_hours
+            )
         
         # Time filter
-        time_filter = ""
+        time_filter: Tuple[str, ...] = ()
+        variables: Dict[str, Any] = {"limit": limit}
         if since_hours:
-            time_filter = f'Block: {{Time: {{since_relative: {{hours_ago: {since_hours}}}}}}},'
-        
-        where_clause = ""
-        if time_filter:
-            where_clause = time_filter + ","
-        
-        query = f"""
-        {{
-          EVM(dataset: {Config.DATASET}, network: {Config.NETWORK}) {{
-            Events(
-              orderBy: {{descending: Block_Time}}
-              where: {{
-                {time_filter}
-                {where_clause}
-                Log: {{Signature: {{Name: {{in: ["OrderFilled"]}}}}}}, 
-                LogHeader: {{
-                  Address: {{
-                    in: [
-                      "{Config.CTF_EXCHANGE_ADDRESS}",
-                      "{Config.LEGACY_EXCHANGE_ADDRESS}"
-                    ]
-                  }}
-                }}
-              }}
-              limit: {{count: {limit * 5 if asset_ids else limit}}}
-            ) {{
-              Block {{
-                Time
-                Number
-                Hash
-              }}
-              Transaction {{
-                Hash
-                From
-                To
-              }}
-              Arguments {{
-                Name
-                Value {{
-                  ... on EVM_ABI_Integer_Value_Arg {{
-                    integer
-                  }}
-                  ... on EVM_ABI_Address_Value_Arg {{
-                    address
-                  }}
-                  ... on EVM_ABI_String_Value_Arg {{
-                    string
-                  }}
-                  ... on EVM_ABI_BigInt_Value_Arg {{
-                    bigInteger
-                  }}
-                  ... on EVM_ABI_Bytes_Value_Arg {{
-                    hex
-                  }}
-                  ... on EVM_ABI_Boolean_Value_Arg {{
-                    bool
-                  }}
-                }}
-              }}
-            }}
-          }}
-        }}
-        """
+            time_filter = ("since_hours",)
+            variables["since_hours"] = since_hours
+        
+        operation = "OrderFilledEvents"
+        if asset_ids:
+            # One selection matching any of the IDs, passed as a list variable
+            operation = "OrderFilledEventsByAssets"
+            variables["asset_ids"] = list(dict.fromkeys(str(asset_id).strip() for asset_id in asset_ids))
+            if trader_address:
+                operation = "OrderFilledEventsByAssetsAndTrader"
+                variables["trader"] = _norm_addr(trader_address)
+        
+        query = _query(operation, *time_filter)
         
         try:
-            result = self._execute_query(query)
-            
-            # Check for GraphQL errors
-            if "errors" in result:
-                error_messages = [err.get("message", "Unknown error") for err in result["errors"]]
-                print(f"GraphQL errors: {', '.join(error_messages)}")
-                return []
-            
-            events = result.get("data", {}).get("EVM", {}).get("Events", [])
-            # Ensure we always return a list, even if the API response is malformed
-            if events is None:
-                return []
-            return events if isinstance(events, list) else []
+            return self._extract_events(self._execute_query(query, variables))
         except Exception as e:
             print(f"Error fetching order filled events: {e}")
             return []
@@ -133,7 +920,8 @@ class BitqueryClient:
         self,
         asset_id: str,
         limit: int = 100,
-        since_hours: Optional[int] = None
+        since_hours: Optional[int] = None,
+        trader_address: Optional[str] = None
     ) -> List[Dict]:
         """Query OrderFilled events filtered by asset ID.
         
@@ -144,201 +932,225 @@ class BitqueryClient:
             asset_id: The asset ID to filter by (as a string or bigInteger)
             limit: Maximum number of events to return
             since_hours: Optional time filter (hours ago)
+            trader_address: Optionally also require this maker or taker
             
         Returns:
             List of OrderFilled events matching the asset ID
         """
         # Time filter
-        time_filter = ""
+        time_filter: Tuple[str, ...] = ()
+        variables: Dict[str, Any] = {"asset_id": str(asset_id), "limit": limit}
         if since_hours:
-            time_filter = f'Block: {{Time: {{since_relative: {{hours_ago: {since_hours}}}}}}},'
-        
-        query = f"""
-        {{
-          EVM(dataset: {Config.DATASET}, network: {Config.NETWORK}) {{
-            Events(
-              orderBy: {{descending: Block_Time}}
-              where: {{
-                {time_filter}
-                Arguments: {{
-                  includes: {{
-                    Value: {{
-                      BigInteger: {{
-                        eq: "{asset_id}"
-                      }}
-                    }}
-                  }}
-                }},
-                Log: {{Signature: {{Name: {{in: ["OrderFilled"]}}}}}}, 
-                LogHeader: {{
-                  Address: {{
-                    in: [
-                      "{Config.CTF_EXCHANGE_ADDRESS}",
-                      "{Config.LEGACY_EXCHANGE_ADDRESS}"
-                    ]
-                  }}
-                }}
-              }}
-              limit: {{count: {limit}}}
-            ) {{
-              Block {{
-                Time
-                Number
-                Hash
-              }}
-              Transaction {{
-                Hash
-                From
-                To
-              }}
-              Arguments {{
-                Name
-                Value {{
-                  ... on EVM_ABI_Integer_Value_Arg {{
-                    integer
-                  }}
-                  ... on EVM_ABI_Address_Value_Arg {{
-                    address
-                  }}
-                  ... on EVM_ABI_String_Value_Arg {{
-                    string
-                  }}
-                  ... on EVM_ABI_BigInt_Value_Arg {{
-                    bigInteger
-                  }}
-                  ... on EVM_ABI_Bytes_Value_Arg {{
-                    hex
-                  }}
-                  ... on EVM_ABI_Boolean_Value_Arg {{
-                    bool
-                  }}
-                }}
-              }}
-            }}
-          }}
-        }}
-        """
+            time_filter = ("since_hours",)
+            variables["since_hours"] = since_hours
+        
+        operation = "OrderFilledEventsByAsset"
+        if trader_address:
+            operation = "OrderFilledEventsByAssetAndTrader"
+            variables["trader"] = _norm_addr(trader_address)
+        
+        query = _query(operation, *time_filter)
         
         try:
-            result = self._execute_query(query)
-            
-            # Check for GraphQL errors
-            if "errors" in result:
-                error_messages = [err.get("message", "Unknown error") for err in result["errors"]]
-                print(f"GraphQL errors: {', '.join(error_messages)}")
-                return []
-            
-            events = result.get("data", {}).get("EVM", {}).get("Events", [])
-            # Ensure we always return a list, even if the API response is malformed
-            if events is None:
-                return []
-            return events if isinstance(events, list) else []
+            return self._extract_events(self._execute_query(query, variables))
         except Exception as e:
             print(f"Error fetching order filled events by asset ID: {e}")
             return []
 
-    def get_order_filled_events_by_trader(
+    def _stream_events(self, query: str, variables: Optional[Dict] = None) -> Iterator[Dict]:
+        """Yield ``data.EVM.Events`` items as they are parsed off the wire.
+        
+        With ijson installed the response body is pull-parsed, so only one
+        event is materialized at a time and parsing overlaps the download.
+        Without it (or on the HTTP/2 transport) this falls back to a regular
+        ``_execute_query``.
+        """
+        payload: Dict[str, Any] = {"query": query}
+        if variables:
+            payload["variables"] = variables
+
+        if ijson is None or self.http2_client is not None:
+            yield from self._extract_events(self._execute_query(query, variables))
+            return
+
+        if orjson is not None:
+            payload_bytes = orjson.dumps(payload)
+        else:
+            payload_bytes = json.dumps(payload).encode("utf-8")
+
+        with self.session.post(
+            self.api_url,
+            data=payload_bytes,
+            timeout=(5, 30),
+            stream=True,
+        ) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+
+            errors: List[Dict] = []
+            parser = ijson.parse(response.raw, use_float=True)
+            for prefix, event, value in parser:
+                if prefix == "data.EVM.Events.item" and event == "start_map":
+                    builder = ijson.ObjectBuilder()
+                    builder.event(event, value)
+                    for prefix, event, value in parser:
+                        builder.event(event, value)
+                        if prefix == "data.EVM.Events.item" and event == "end_map":
+                            break
+                    yield builder.value
+                elif prefix == "errors.item.message":
+                    errors.append({"message": value})
+
+            if errors:
+                _print_errors(errors)
+
+    def _iter_pages(
+        self,
+        operation: str,
+        filters: Tuple[str, ...],
+        variables: Dict[str, Any],
+        limit: int,
+        page_size: int
+    ) -> Iterator[Dict]:
+        """Yield up to ``limit`` events of ``operation``, newest first, page by page.
+        
+        Each page continues below the last block seen (or, when one block
+        fills whole pages, at an offset into it), so a failed request costs
+        one page rather than the whole result and callers that stop early
+        never request the remaining pages.
+        """
+        variables = dict(variables)
+        remaining = limit
+        while remaining > 0:
+            page_limit = min(page_size, remaining)
+            variables["limit"] = page_limit
+            page_filters = filters
+            if "before_block" in variables:
+                page_filters += ("before_block",)
+            if variables.get("offset"):
+                page_filters += ("offset",)
+            # Events are yielded as they are parsed, holding back only the
+            # newest-seen block: the page may end partway through it, in
+            # which case its events are fetched whole with the next page.
+            received = 0
+            yielded = 0
+            held: List[Dict] = []
+            held_block = None
+            for event in self._stream_events(_query(operation, *page_filters), variables):
+                received += 1
+                block = int(event["Block"]["Number"])
+                if block != held_block:
+                    yield from held
+                    yielded += len(held)
+                    held = []
+                    held_block = block
+                held.append(event)
+
+            if received < page_limit:
+                # Last page
+                yield from held
+                return
+
+            if yielded:
+                variables["before_block"] = held_block + 1
+                variables.pop("offset", None)
+            else:
+                # A single block filled the page; keep the cursor on it and
+                # skip the rows already seen
+                seen = variables.get("offset", 0) if variables.get("before_block") == held_block + 1 else 0
+                variables["before_block"] = held_block + 1
+                variables["offset"] = seen + len(held)
+                yield from held
+                yielded = len(held)
+
+            remaining -= yielded
+
+    def iter_order_filled_events(
+        self,
+        limit: int = 20,
+        since_hours: Optional[int] = None,
+        page_size: int = 500
+    ) -> Iterator[Dict]:
+        """Lazily yield recent OrderFilled events, newest first, in pages of ``page_size``."""
+        time_filter: Tuple[str, ...] = ()
+        variables: Dict[str, Any] = {}
+        if since_hours:
+            time_filter = ("since_hours",)
+            variables["since_hours"] = since_hours
+
+        try:
+            yield from self._iter_pages("OrderFilledEvents", time_filter, variables, limit, page_size)
+        except Exception as e:
+            print(f"Error fetching order filled events: {e}")
+
+    def iter_order_filled_events_by_trader(
         self,
         trader_address: str,
         limit: int = 10000,
-        since_hours: Optional[int] = None
-    ) -> List[Dict]:
-        """Query OrderFilled events filtered by maker or taker address."""
+        since_hours: Optional[int] = None,
+        page_size: int = 500
+    ) -> Iterator[Dict]:
+        """Lazily yield OrderFilled events where the address is maker or taker.
+        
+        Events are fetched newest first in pages of ``page_size`` (see
+        ``_iter_pages``), so callers that stop early (e.g. once they have
+        enough positions) never request the remaining pages.
+        """
         if not trader_address:
-            return []
+            return
 
-        trader_address_normalized = trader_address.lower()
+        trader_address_normalized = _norm_addr(trader_address)
 
         # Time filter
-        time_filter = ""
+        time_filter: Tuple[str, ...] = ()
+        variables: Dict[str, Any] = {"trader": trader_address_normalized}
         if since_hours:
-            time_filter = f'Block: {{Time: {{since_relative: {{hours_ago: {since_hours}}}}}}},'
-
-        query = f"""
-        {{
-          EVM(dataset: {Config.DATASET}, network: {Config.NETWORK}) {{
-            Events(
-              orderBy: {{descending: Block_Time}}
-              where: {{
-                {time_filter}
-                Arguments: {{
-                  includes: {{
-                    Name: {{
-                      in: ["maker", "taker"]
-                    }},
-                    Value: {{
-                      Address: {{
-                        is: "{trader_address_normalized}"
-                      }}
-                    }}
-                  }}
-                }},
-                Log: {{Signature: {{Name: {{in: ["OrderFilled"]}}}}}}, 
-                LogHeader: {{
-                  Address: {{
-                    in: [
-                      "{Config.CTF_EXCHANGE_ADDRESS}",
-                      "{Config.LEGACY_EXCHANGE_ADDRESS}"
-                    ]
-                  }}
-                }}
-              }}
-              limit: {{count: {limit}}}
-            ) {{
-              Block {{
-                Time
-                Number
-                Hash
-              }}
-              Transaction {{
-                Hash
-                From
-                To
-              }}
-              Arguments {{
-                Name
-                Value {{
-                  ... on EVM_ABI_Integer_Value_Arg {{
-                    integer
-                  }}
-                  ... on EVM_ABI_Address_Value_Arg {{
-                    address
-                  }}
-                  ... on EVM_ABI_String_Value_Arg {{
-                    string
-                  }}
-                  ... on EVM_ABI_BigInt_Value_Arg {{
-                    bigInteger
-                  }}
-                  ... on EVM_ABI_Bytes_Value_Arg {{
-                    hex
-                  }}
-                  ... on EVM_ABI_Boolean_Value_Arg {{
-                    bool
-                  }}
-                }}
-              }}
-            }}
-          }}
-        }}
-        """
+            time_filter = ("since_hours",)
+            variables["since_hours"] = since_hours
 
         try:
-            result = self._execute_query(query)
-
-            if "errors" in result:
-                error_messages = [err.get("message", "Unknown error") for err in result["errors"]]
-                print(f"GraphQL errors: {', '.join(error_messages)}")
-                return []
-
-            events = result.get("data", {}).get("EVM", {}).get("Events", [])
-            if events is None:
-                return []
-            return events if isinstance(events, list) else []
+            yield from self._iter_pages("OrderFilledEventsByTrader", time_filter, variables, limit, page_size)
         except Exception as e:
             print(f"Error fetching order filled events by trader: {e}")
-            return []
+
+    def get_order_filled_events_by_trader(
+        self,
+        trader_address: str,
+        limit: int = 10000,
+        since_hours: Optional[int] = None,
+        page_size: int = 500
+    ) -> List[Dict]:
+        """Query OrderFilled events filtered by maker or taker address."""
+        return list(self.iter_order_filled_events_by_trader(
+            trader_address, limit=limit, since_hours=since_hours, page_size=page_size
+        ))
     
+    def iter_follow_trader(
+        self,
+        maker_address: str,
+        limit: int = 10000,
+        since_hours: Optional[int] = None,
+        page_size: int = 500
+    ) -> Iterator[Dict]:
+        """Lazily yield OrderFilled events where the address is the maker, newest first.
+        
+        Paged like ``iter_order_filled_events_by_trader``.
+        """
+        if not maker_address:
+            return
+
+        # Time filter
+        time_filter: Tuple[str, ...] = ()
+        variables: Dict[str, Any] = {"maker": _norm_addr(maker_address)}
+        if since_hours:
+            time_filter = ("since_hours",)
+            variables["since_hours"] = since_hours
+
+        try:
+            yield from self._iter_pages("OrderFilledEventsByMaker", time_filter, variables, limit, page_size)
+        except Exception as e:
+            print(f"Error fetching order filled events for maker: {e}")
+
     def follow_trader(
         self,
         maker_address: str,
@@ -361,94 +1173,19 @@ class BitqueryClient:
         if not maker_address:
             return []
 
-        maker_address_normalized = maker_address.lower()
+        maker_address_normalized = _norm_addr(maker_address)
 
         # Time filter
-        time_filter = ""
+        time_filter: Tuple[str, ...] = ()
+        variables: Dict[str, Any] = {"maker": maker_address_normalized, "limit": limit}
         if since_hours:
-            time_filter = f'Block: {{Time: {{since_relative: {{hours_ago: {since_hours}}}}}}},'
-
-        query = f"""
-        {{
-          EVM(dataset: {Config.DATASET}, network: {Config.NETWORK}) {{
-            Events(
-              orderBy: {{descending: Block_Time}}
-              where: {{
-                {time_filter}
-                Arguments: {{
-                  includes: {{
-                    Name: {{
-                      is: "maker"
-                    }},
-                    Value: {{
-                      Address: {{
-                        is: "{maker_address_normalized}"
-                      }}
-                    }}
-                  }}
-                }},
-                Log: {{Signature: {{Name: {{in: ["OrderFilled"]}}}}}}, 
-                LogHeader: {{
-                  Address: {{
-                    in: [
-                      "{Config.CTF_EXCHANGE_ADDRESS}",
-                      "{Config.LEGACY_EXCHANGE_ADDRESS}"
-                    ]
-                  }}
-                }}
-              }}
-              limit: {{count: {limit}}}
-            ) {{
-              Block {{
-                Time
-                Number
-                Hash
-              }}
-              Transaction {{
-                Hash
-                From
-                To
-              }}
-              Arguments {{
-                Name
-                Value {{
-                  ... on EVM_ABI_Integer_Value_Arg {{
-                    integer
-                  }}
-                  ... on EVM_ABI_Address_Value_Arg {{
-                    address
-                  }}
-                  ... on EVM_ABI_String_Value_Arg {{
-                    string
-                  }}
-                  ... on EVM_ABI_BigInt_Value_Arg {{
-                    bigInteger
-                  }}
-                  ... on EVM_ABI_Bytes_Value_Arg {{
-                    hex
-                  }}
-                  ... on EVM_ABI_Boolean_Value_Arg {{
-                    bool
-                  }}
-                }}
-              }}
-            }}
-          }}
-        }}
-        """
+            time_filter = ("since_hours",)
+            variables["since_hours"] = since_hours
 
-        try:
-            result = self._execute_query(query)
+        query = _query("OrderFilledEventsByMaker", *time_filter)
 
-            if "errors" in result:
-                error_messages = [err.get("message", "Unknown error") for err in result["errors"]]
-                print(f"GraphQL errors: {', '.join(error_messages)}")
-                return []
-
-            events = result.get("data", {}).get("EVM", {}).get("Events", [])
-            if events is None:
-                return []
-            return events if isinstance(events, list) else []
+        try:
+            return self._extract_events(self._execute_query(query, variables))
         except Exception as e:
             print(f"Error fetching order filled events for maker: {e}")
             return []
@@ -460,57 +1197,15 @@ class BitqueryClient:
         since_days: int = 6
     ) -> List[Dict]:
         """Query TokenRegistered events."""
-        condition_filter = ""
+        condition_filter: Tuple[str, ...] = ()
+        variables: Dict[str, Any] = {"limit": limit, "since_days": since_days}
         if condition_id:
-            condition_filter = f'''
-                Arguments: {{
-                  includes: {{
-                    Name: {{is: "conditionId"}}, 
-                    Value: {{Bytes: {{is: "{condition_id}"}}}}
-                  }}
-                }},
-            '''
-        
-        query = f"""
-        {{
-          EVM(dataset: combined, network: {Config.NETWORK}) {{
-            Events(
-              orderBy: {{descending: Block_Time}}
-              where: {{
-                Block: {{Time: {{since_relative: {{days_ago: {since_days}}}}}}},
-                {condition_filter}
-                Log: {{Signature: {{Name: {{in: ["TokenRegistered"]}}}}}}, 
-                LogHeader: {{Address: {{is: "{Config.LEGACY_EXCHANGE_ADDRESS}"}}}}
-              }}
-              limit: {{count: {limit}}}
-            ) {{
-              Block {{
-                Time
-                Number
-              }}
-              Transaction {{
-                Hash
-                From
-              }}
-              Arguments {{
-                Name
-                Value {{
-                  ... on EVM_ABI_BigInt_Value_Arg {{
-                    bigInteger
-                  }}
-                  ... on EVM_ABI_Bytes_Value_Arg {{
-                    hex
-                  }}
-                }}
-              }}
-            }}
-          }}
-        }}
-        """
+            condition_filter = ("condition_id",)
+            variables["condition_id"] = condition_id
         
-        result = self._execute_query(query)
-        events = result.get("data", {}).get("EVM", {}).get("Events", [])
-        return events
+        query = _query("TokenRegisteredEvents", *condition_filter)
+        
+        return self._extract_events(self._execute_query(query, variables))
     
     def get_order_matched_events(
         self,
@@ -518,55 +1213,17 @@ class BitqueryClient:
         since_hours: Optional[int] = None
     ) -> List[Dict]:
         """Query OrderMatched events."""
-        time_filter = ""
+        time_filter: Tuple[str, ...] = ()
+        variables: Dict[str, Any] = {"limit": limit}
         if since_hours:
-            time_filter = f'Block: {{Time: {{since_relative: {{hours_ago: {since_hours}}}}}}},'
-        
-        query = f"""
-        {{
-          EVM(dataset: {Config.DATASET}, network: {Config.NETWORK}) {{
-            Events(
-              orderBy: {{descending: Block_Time}}
-              where: {{
-                {time_filter}
-                Log: {{Signature: {{Name: {{in: ["OrdersMatched"]}}}}}}, 
-                LogHeader: {{Address: {{is: "{Config.CTF_EXCHANGE_ADDRESS}"}}}}
-              }}
-              limit: {{count: {limit}}}
-            ) {{
-              Block {{
-                Time
-                Number
-                Hash
-              }}
-              Transaction {{
-                Hash
-                From
-                To
-              }}
-              Arguments {{
-                Name
-                Value {{
-                  ... on EVM_ABI_Integer_Value_Arg {{
-                    integer
-                  }}
-                  ... on EVM_ABI_BigInt_Value_Arg {{
-                    bigInteger
-                  }}
-                  ... on EVM_ABI_Address_Value_Arg {{
-                    address
-                  }}
-                }}
-              }}
-            }}
-          }}
-        }}
-        """
+            time_filter = ("since_hours",)
+            variables["since_hours"] = since_hours
         
-        result = self._execute_query(query)
-        events = result.get("data", {}).get("EVM", {}).get("Events", [])
-        return events
+        query = _query("OrdersMatchedEvents", *time_filter)
+        
+        return self._extract_events(self._execute_query(query, variables))
     
+    @_cached_lookup
     def get_token_registered_by_asset_id(
         self,
         asset_id: str,
@@ -583,100 +1240,16 @@ class BitqueryClient:
         Returns:
             List of TokenRegistered events containing the asset ID
         """
-        query = f"""
-        {{
-          EVM(dataset: archive, network: {Config.NETWORK}) {{
-            Events(
-              orderBy: {{descending: Block_Time}}
-              where: {{
-                Arguments: {{
-                  includes: {{
-                    Value: {{
-                      String: {{
-                        includesCaseInsensitive: "{asset_id}"
-                      }}
-                    }}
-                  }}
-                }},
-                Log: {{
-                  Signature: {{
-                    Name: {{
-                      includesCaseInsensitive: "tokenregistered"
-                    }}
-                  }}
-                }},
-                Block: {{
-                  Time: {{
-                    since_relative: {{
-                      days_ago: {since_days}
-                    }}
-                  }}
-                }}
-              }}
-              limit: {{count: {limit}}}
-            ) {{
-              Block {{
-                Time
-                Number
-                Hash
-              }}
-              Transaction {{
-                Hash
-                From
-                To
-              }}
-              TransactionStatus {{
-                Success
-              }}
-              Arguments {{
-                Name
-                Value {{
-                  ... on EVM_ABI_Integer_Value_Arg {{
-                    integer
-                  }}
-                  ... on EVM_ABI_Address_Value_Arg {{
-                    address
-                  }}
-                  ... on EVM_ABI_String_Value_Arg {{
-                    string
-                  }}
-                  ... on EVM_ABI_BigInt_Value_Arg {{
-                    bigInteger
-                  }}
-                  ... on EVM_ABI_Bytes_Value_Arg {{
-                    hex
-                  }}
-                  ... on EVM_ABI_Boolean_Value_Arg {{
-                    bool
-                  }}
-                }}
-              }}
-              Log {{
-                SmartContract
-                Signature {{
-                  Name
-                }}
-              }}
-            }}
-          }}
-        }}
-        """
+        query = _query("TokenRegisteredByAsset")
+        variables = {"asset_id": str(asset_id), "limit": limit, "since_days": since_days}
         
         try:
-            result = self._execute_query(query)
-            
-            # Check for GraphQL errors
-            if "errors" in result:
-                error_messages = [err.get("message", "Unknown error") for err in result["errors"]]
-                print(f"GraphQL errors: {', '.join(error_messages)}")
-                return []
-            
-            events = result.get("data", {}).get("EVM", {}).get("Events", [])
-            return events if isinstance(events, list) else []
+            return self._extract_events(self._execute_query(query, variables))
         except Exception as e:
             print(f"Error fetching token registered events by asset ID: {e}")
             return []
-    
+
+    @_cached_lookup
     def get_question_events_by_condition_id(
         self,
         condition_id: str,
@@ -693,105 +1266,16 @@ class BitqueryClient:
         Returns:
             List of QuestionInitialized/ConditionPreparation events
         """
-        query = f"""
-        {{
-          EVM(dataset: archive, network: {Config.NETWORK}) {{
-            Events(
-              orderBy: {{descending: Block_Time}}
-              where: {{
-                Block: {{
-                  Time: {{
-                    since_relative: {{
-                      days_ago: {since_days}
-                    }}
-                  }}
-                }},
-                Arguments: {{
-                  includes: {{
-                    Name: {{
-                      in: ["questionID", "conditionId"]
-                    }},
-                    Value: {{
-                      Bytes: {{
-                        is: "{condition_id}"
-                      }}
-                    }}
-                  }}
-                }},
-                Log: {{
-                  Signature: {{
-                    Name: {{
-                      in: ["QuestionInitialized", "ConditionPreparation"]
-                    }}
-                  }}
-                }},
-                LogHeader: {{
-                  Address: {{
-                    in: [
-                      "0x4d97dcd97ec945f40cf65f87097ace5ea0476045",
-                      "0x65070BE91477460D8A7AeEb94ef92fe056C2f2A7"
-                    ]
-                  }}
-                }}
-              }}
-              limit: {{count: {limit}}}
-            ) {{
-              Block {{
-                Time
-                Number
-                Hash
-              }}
-              Transaction {{
-                Hash
-                From
-                To
-              }}
-              TransactionStatus {{
-                Success
-              }}
-              Arguments {{
-                Name
-                Value {{
-                  ... on EVM_ABI_Integer_Value_Arg {{
-                    integer
-                  }}
-                  ... on EVM_ABI_Address_Value_Arg {{
-                    address
-                  }}
-                  ... on EVM_ABI_String_Value_Arg {{
-                    string
-                  }}
-                  ... on EVM_ABI_BigInt_Value_Arg {{
-                    bigInteger
-                  }}
-                  ... on EVM_ABI_Bytes_Value_Arg {{
-                    hex
-                  }}
-                  ... on EVM_ABI_Boolean_Value_Arg {{
-                    bool
-                  }}
-                }}
-              }}
-            }}
-          }}
-        }}
-        """
+        query = _query("QuestionEventsByCondition")
+        variables = {"condition_id": condition_id, "limit": limit, "since_days": since_days}
         
         try:
-            result = self._execute_query(query)
-            
-            # Check for GraphQL errors
-            if "errors" in result:
-                error_messages = [err.get("message", "Unknown error") for err in result["errors"]]
-                print(f"GraphQL errors: {', '.join(error_messages)}")
-                return []
-            
-            events = result.get("data", {}).get("EVM", {}).get("Events", [])
-            return events if isinstance(events, list) else []
+            return self._extract_events(self._execute_query(query, variables))
         except Exception as e:
             print(f"Error fetching question events by condition ID: {e}")
             return []
     
+    @_cached_lookup
     def get_question_data_by_question_id(
         self,
         question_id: str,
@@ -809,173 +1293,67 @@ class BitqueryClient:
             List of events containing question data with ancillaryData
         """
         # Ensure question_id is in the correct format (hex without 0x)
-        question_id_clean = question_id.replace("0x", "").lower()
-        
-        query = f"""
-        {{
-          EVM(dataset: archive, network: {Config.NETWORK}) {{
-            Events(
-              orderBy: {{descending: Block_Time}}
-              where: {{
-                Block: {{
-                  Time: {{
-                    since_relative: {{
-                      days_ago: {since_days}
-                    }}
-                  }}
-                }},
-                Arguments: {{
-                  includes: {{
-                    Name: {{
-                      in: ["questionID"]
-                    }},
-                    Value: {{
-                      Bytes: {{
-                        is: "{question_id_clean}"
-                      }}
-                    }}
-                  }}
-                }},
-                Log: {{
-                  Signature: {{
-                    Name: {{
-                      in: ["QuestionInitialized"]
-                    }}
-                  }}
-                }},
-                LogHeader: {{
-                  Address: {{
-                    in: ["0x65070BE91477460D8A7AeEb94ef92fe056C2f2A7"]
-                  }}
-                }}
-              }}
-              limit: {{count: {limit}}}
-            ) {{
-              Block {{
-                Time
-                Number
-                Hash
-              }}
-              Transaction {{
-                Hash
-                From
-                To
-              }}
-              TransactionStatus {{
-                Success
-              }}
-              Arguments {{
-                Name
-                Value {{
-                  ... on EVM_ABI_Integer_Value_Arg {{
-                    integer
-                  }}
-                  ... on EVM_ABI_Address_Value_Arg {{
-                    address
-                  }}
-                  ... on EVM_ABI_String_Value_Arg {{
-                    string
-                  }}
-                  ... on EVM_ABI_BigInt_Value_Arg {{
-                    bigInteger
-                  }}
-                  ... on EVM_ABI_Bytes_Value_Arg {{
-                    hex
-                  }}
-                  ... on EVM_ABI_Boolean_Value_Arg {{
-                    bool
-                  }}
-                }}
-              }}
-            }}
-          }}
-        }}
-        """
+        question_id_clean = _norm_hex(question_id)
+        
+        # QuestionInitialized data is immutable, so check the local index first
+        indexed = None if self.fresh else self.question_index.get(question_id_clean)
+        if indexed is not None:
+            return [indexed]
+        
+        query = _query("QuestionDataByQuestion")
+        variables = {"question_id": question_id_clean, "limit": limit, "since_days": since_days}
         
         try:
-            result = self._execute_query(query)
-            
-            # Check for GraphQL errors
-            if "errors" in result:
-                error_messages = [err.get("message", "Unknown error") for err in result["errors"]]
-                print(f"GraphQL errors: {', '.join(error_messages)}")
-                return []
-            
-            events = result.get("data", {}).get("EVM", {}).get("Events", [])
-            return events if isinstance(events, list) else []
+            events = self._extract_events(self._execute_query(query, variables))
+            self.question_index.add_events(events)
+            return events
         except Exception as e:
             print(f"Error fetching question data by question ID: {e}")
             return []
 
-    def get_recent_question_initialized_events(self, limit: int = 25) -> List[Dict]:
-        """Fetch recent QuestionInitialized events for ancillaryData analysis."""
-        query = f"""
-        {{
-          EVM(dataset: {Config.DATASET}, network: {Config.NETWORK}) {{
-            Events(
-              orderBy: {{descending: Block_Time}}
-              where: {{
-                Log: {{Signature: {{Name: {{in: ["QuestionInitialized"]}}}}}},
-                LogHeader: {{
-                  Address: {{
-                    is: "{Config.QUESTION_CONTRACT_ADDRESS}"
-                  }}
-                }}
-              }}
-              limit: {{count: {limit}}}
-            ) {{
-              Block {{
-                Time
-                Number
-                Hash
-              }}
-              Transaction {{
-                Hash
-                From
-                To
-              }}
-              TransactionStatus {{
-                Success
-              }}
-              Arguments {{
-                Name
-                Value {{
-                  ... on EVM_ABI_Integer_Value_Arg {{
-                    integer
-                  }}
-                  ... on EVM_ABI_Address_Value_Arg {{
-                    address
-                  }}
-                  ... on EVM_ABI_String_Value_Arg {{
-                    string
-                  }}
-                  ... on EVM_ABI_BigInt_Value_Arg {{
-                    bigInteger
-                  }}
-                  ... on EVM_ABI_Bytes_Value_Arg {{
-                    hex
-                  }}
-                  ... on EVM_ABI_Boolean_Value_Arg {{
-                    bool
-                  }}
-                }}
-              }}
-            }}
-          }}
-        }}
+    def get_recent_question_initialized_events(self, limit: int = 25, page_size: int = 200) -> List[Dict]:
+        """Fetch recent QuestionInitialized events for ancillaryData analysis.
+        
+        Limits above ``page_size`` are split into offset pages that are
+        fetched concurrently and concatenated in order.
         """
+        if limit <= page_size:
+            pages = [self._fetch_question_initialized_page(limit, 0)]
+        else:
+            pages = self.gather_many(*(
+                functools.partial(
+                    self._fetch_question_initialized_page,
+                    min(page_size, limit - offset),
+                    offset,
+                )
+                for offset in range(0, limit, page_size)
+            ))
+
+        # A question emitted between page requests shifts later pages by
+        # one, so drop any event already returned by an earlier page
+        seen = set()
+        events = []
+        for event in (event for page in pages for event in page):
+            question_id = next(
+                (str((arg.get("Value") or {}).get("hex")) for arg in event.get("Arguments") or [] if arg.get("Name") == "questionID"),
+                None,
+            )
+            key = ((event.get("Transaction") or {}).get("Hash"), question_id)
+            if key not in seen:
+                seen.add(key)
+                events.append(event)
+        self.question_index.add_events(events)
+        return events
+
+    def _fetch_question_initialized_page(self, limit: int, offset: int) -> List[Dict]:
+        filters: Tuple[str, ...] = ("offset",) if offset else ()
+        variables: Dict[str, Any] = {"limit": limit}
+        if offset:
+            variables["offset"] = offset
         
         try:
-            result = self._execute_query(query)
+            return self._extract_events(self._execute_query(_query("RecentQuestionInitialized", *filters), variables))
         except Exception as exc:  # pragma: no cover - network errors bubble up
             print(f"Error fetching question initialized events: {exc}")
             return []
 
-        if "errors" in result:
-            error_messages = [err.get("message", "Unknown error") for err in result["errors"]]
-            print(f"GraphQL errors: {', '.join(error_messages)}")
-            return []
-        
-        events = result.get("data", {}).get("EVM", {}).get("Events", [])
-        return events if isinstance(events, list) else []
-
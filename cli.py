@@ -1,24 +1,210 @@
 """Command-line interface for Polymarket Copy Trading Tool."""
+import atexit
+import csv
+import sys
+import traceback
 import click
 from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-from rich import box
 from datetime import datetime
-from typing import Optional
+from itertools import chain, islice
+from operator import attrgetter, itemgetter
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
 
-from bitquery_client import BitqueryClient
-from position_tracker import PositionTracker
-from question_analyzer import QuestionAnalyzer
 from config import Config
 
-console = Console(force_terminal=True, width=None)  # Allow unlimited width to prevent truncation
+# Tables, panels and the Bitquery/requests stack are imported inside the
+# commands that use them, so ``--help`` and single commands start quickly.
+if TYPE_CHECKING:
+    from rich.table import Table
+    from bitquery_cache import ResultCache
+    from bitquery_client import BitqueryClient
+    from position_tracker import Position, PositionTracker
+
+console = Console(width=None)  # Allow unlimited width to prevent truncation
+
+# When output is piped, tables are written as CSV instead of rendered by Rich,
+# and everything else (panels, status and the tracker's diagnostic prints)
+# goes to stderr so stdout carries only the CSV
+IS_TTY = sys.stdout.isatty()
+_csv_stdout = sys.stdout
+
+
+_client: Optional["BitqueryClient"] = None
+_tracker: Optional["PositionTracker"] = None
+_result_cache: Optional["ResultCache"] = None
+
+# Question text is fixed for the life of a market; prices move constantly
+QUESTION_DETAILS_TTL = Config.CACHE_TTL_SECONDS
+MARKET_PRICE_TTL = 30
+
+
+def get_client(fresh: bool = False) -> "BitqueryClient":
+    """Return the shared BitqueryClient, so every query reuses its warm connection pool.
+    
+    ``fresh`` (like the group's ``--fresh``) creates it without the response
+    cache and with its ID lookup caches bypassed.
+    """
+    global _client
+    if _client is None:
+        from bitquery_client import BitqueryClient
+        fresh = _fresh or fresh
+        _client = BitqueryClient(response_cache=None if fresh else get_result_cache(), fresh=fresh)
+        atexit.register(_client.close)
+    return _client
+
+
+def get_tracker(fresh: bool = False) -> "PositionTracker":
+    """Return the shared PositionTracker, bound to the shared client."""
+    global _tracker
+    if _tracker is None:
+        from position_tracker import PositionTracker
+        _tracker = PositionTracker(get_client(fresh=fresh))
+    return _tracker
+
+
+def get_result_cache() -> "ResultCache":
+    """Return the shared on-disk result cache."""
+    global _result_cache
+    if _result_cache is None:
+        from bitquery_cache import ResultCache
+        _result_cache = ResultCache()
+        atexit.register(_result_cache.close)
+    return _result_cache
+
+
+# Rows per live positions table before it is finalized and a new one started
+STREAM_CHUNK_ROWS = 500
+
+# Column layout shared by every positions table (monitor, follow-trader, ...).
+# Widths come from the rows (see _make_positions_table); IDs fold only when
+# the terminal is too narrow for them.
+_POSITION_COLUMNS = [
+    ("Maker", {"style": "cyan", "overflow": "fold"}),
+    ("Taker", {"style": "cyan", "overflow": "fold"}),
+    ("Asset ID", {"style": "green", "overflow": "fold"}),
+    ("Amount", {"style": "yellow", "justify": "right"}),
+    ("Price", {"style": "magenta", "justify": "right"}),
+    ("Time", {"style": "blue"}),
+    ("TX Hash", {"style": "dim", "overflow": "fold"}),
+]
+
+
+def _make_positions_table(title: Optional[str], rows: Optional[List[Tuple[str, ...]]] = None) -> "Table":
+    """Return an empty positions table, its columns fitted to ``rows`` when given.
+    
+    Without ``rows`` (live tables that fill as positions stream in) Rich
+    sizes the columns to their cells on each refresh.
+    """
+    from rich import box
+    from rich.table import Table
+    
+    table = Table(title=title, box=box.ROUNDED, expand=True, show_header=True, width=None)
+    if rows is not None:
+        _add_fitted_columns(table, _POSITION_COLUMNS, rows)
+        return table
+    for header, options in _POSITION_COLUMNS:
+        if "overflow" in options:
+            table.add_column(header, **options)
+        else:
+            table.add_column(header, no_wrap=True, **options)
+    return table
+
+
+_position_fields = attrgetter('maker_address', 'taker_address', 'asset_id', 'amount', 'price', 'timestamp', 'tx_hash')
+
+
+def _status(message: str, fg: Optional[str] = None, dim: bool = False) -> None:
+    """Print a one-line status message without going through Rich's markup parser.
+    
+    When stdout is piped (CSV output), status lines go to stderr instead.
+    While the console is recording (``--log-file``) they are printed through
+    it, as plain ``Text``, so the saved log keeps them.
+    """
+    if console.record:
+        from rich.text import Text
+        console.print(Text(message, style=" ".join(filter(None, (fg, dim and "dim")))), highlight=False)
+    else:
+        click.secho(message, err=not IS_TTY, fg=fg, dim=dim)
+
+
+def _position_row(pos: "Position") -> Tuple[str, ...]:
+    maker, taker, asset_id, amount, price, timestamp, tx_hash = _position_fields(pos)
+    return (maker, taker, asset_id, "%.4f" % amount, "%.4f" % price, _timestamp_text(timestamp), tx_hash)
+
+
+def _csv_writer(table: "Table"):
+    """Return a CSV writer on stdout that has already written ``table``'s headers."""
+    writer = csv.writer(_csv_stdout)
+    writer.writerow([column.header for column in table.columns])
+    return writer
+
+
+def _print_table(table: "Table", rows: Iterable[Tuple[str, ...]]) -> None:
+    """Print ``rows`` through ``table``, or as CSV when stdout is not a terminal."""
+    if not IS_TTY:
+        _csv_writer(table).writerows(rows)
+        return
+    add_row = table.add_row
+    for row in rows:
+        add_row(*row)
+    console.print(table)
+
+
+def _stream_positions(table: "Table", positions: Iterable["Position"]) -> None:
+    """Render ``table`` live, adding a row for each position as it is parsed.
+    
+    Once a table holds as many rows as fit on the terminal (at most
+    ``STREAM_CHUNK_ROWS``) it is left on screen and rows continue in a fresh
+    positions table. A live region taller than the terminal cannot be
+    redrawn in place, so every refresh would reprint it into scrollback.
+    """
+    rows = map(_position_row, positions)
+    if not IS_TTY:
+        _csv_writer(table).writerows(rows)
+        return
+    
+    from rich.live import Live
+    
+    # Title, borders and header take five lines; rows that fold across lines
+    # are cropped while live and shown in full once the table is finished
+    chunk_rows = max(1, min(STREAM_CHUNK_ROWS, console.height - 5))
+    row = next(rows, None)
+    while row is not None:
+        add_row = table.add_row
+        with Live(table, console=console, refresh_per_second=4):
+            for row in chain([row], islice(rows, chunk_rows - 1)):
+                add_row(*row)
+        row = next(rows, None)
+        table = _make_positions_table(None)
+
+
+def _add_fitted_columns(table: "Table", columns: List[Tuple[str, Dict]], rows: List[Tuple[str, ...]]) -> None:
+    """Add ``columns`` to ``table`` sized to the widest header or cell in ``rows``.
+    
+    Pinning widths from one pass over the rows spares Rich from measuring
+    and wrapping every cell. Columns that set an ``overflow`` (long IDs) may
+    still fold on narrow terminals; the rest never wrap or shrink.
+    """
+    widths = [len(header) for header, _ in columns]
+    for row in rows:
+        widths = [max(width, len(cell)) for width, cell in zip(widths, row)]
+    for (header, options), width in zip(columns, widths):
+        if "overflow" in options:
+            table.add_column(header, max_width=width, **options)
+        else:
+            table.add_column(header, no_wrap=True, min_width=width, max_width=width, **options)
+
+
+def _timestamp_text(value: datetime) -> str:
+    """``value`` as ``YYYY-MM-DD HH:MM:SS``, via C-level isoformat rather than strftime."""
+    # Slicing drops the "+00:00" that isoformat adds for aware timestamps
+    return value.isoformat(" ", "seconds")[:19]
 
 
 def _format_time(value: datetime | None) -> str:
     if not value:
         return "—"
-    return value.strftime("%Y-%m-%d %H:%M:%S")
+    return _timestamp_text(value)
 
 
 def _shorten(value: str | None, length: int = 12) -> str:
@@ -28,13 +214,25 @@ def _shorten(value: str | None, length: int = 12) -> str:
         return value
     return f"{value[:length//2]}…{value[-length//2:]}"
 
+_debug = False
+_fresh = False
+
+
 @click.group()
-def cli():
+@click.option('--debug', is_flag=True, help='Print full tracebacks for errors')
+@click.option('--fresh', is_flag=True, help='Bypass the caches of Bitquery responses and ID lookups')
+def cli(debug: bool, fresh: bool):
     """Polymarket Copy Trading Tool - Monitor and copy trades from CTF Exchange."""
+    global _debug, _fresh
+    _debug = debug
+    _fresh = fresh
+    if not IS_TTY:
+        # Rich's console and bare print() both resolve sys.stdout at write time
+        sys.stdout = sys.stderr
     try:
         Config.validate()
     except ValueError as e:
-        console.print(f"[red]Error: {e}[/red]")
+        _status(f"Error: {e}", fg="red")
         raise click.Abort()
 
 @cli.command()
@@ -42,44 +240,26 @@ def cli():
 @click.option('--limit', '-l', default=20, help='Number of positions to fetch')
 def monitor(address: str, limit: int):
     """Monitor trades from a specific trader address."""
-    console.print(f"[cyan]Monitoring trader: {address}[/cyan]")
+    _status(f"Monitoring trader: {address}", fg="cyan")
     
-    client = BitqueryClient()
-    tracker = PositionTracker(client)
+    tracker = get_tracker()
     
     try:
-        positions = tracker.track_trader(address, limit=limit)
+        positions = tracker.iter_trader_positions(address, limit=limit)
+        first = next(positions, None)
         
-        if not positions:
-            console.print("[yellow]No positions found for this trader.[/yellow]")
+        if first is None:
+            _status("No positions found for this trader.", fg="yellow")
             return
         
         # Display positions
-        table = Table(title=f"Positions from {address}", box=box.ROUNDED, expand=True, show_header=True, width=None)
-        table.add_column("Maker", style="cyan", no_wrap=False, overflow="fold", min_width=20, max_width=20)
-        table.add_column("Taker", style="cyan", no_wrap=False, overflow="fold", min_width=20, max_width=20)
-        table.add_column("Asset ID", style="green", no_wrap=False, overflow="fold", min_width=20, max_width=20)
-        table.add_column("Amount", style="yellow", justify="right", min_width=10, max_width=10)
-        table.add_column("Price", style="magenta", justify="right", min_width=10, max_width=10)
-        table.add_column("Time", style="blue", min_width=19, max_width=19)
-        table.add_column("TX Hash", style="dim", no_wrap=False, overflow="fold", min_width=20, max_width=20)
-        
-        for pos in positions:
-            table.add_row(
-                pos.maker_address,
-                pos.taker_address,
-                pos.asset_id,
-                f"{pos.amount:.4f}",
-                f"{pos.price:.4f}",
-                pos.timestamp.strftime("%Y-%m-%d %H:%M:%S"),
-                pos.tx_hash
-            )
+        table = _make_positions_table(f"Positions from {address}")
         
-        console.print(table)
+        _stream_positions(table, chain([first], positions))
         
     
     except Exception as e:
-        console.print(f"[red]Error: {e}[/red]")
+        _status(f"Error: {e}", fg="red")
         raise click.Abort()
 
 @cli.command()
@@ -93,53 +273,49 @@ def follow_trader(address: str, limit: int, since_hours: Optional[int]):
     matches the provided address, allowing you to track trades where
     a specific trader is making orders.
     """
-    console.print(f"[cyan]Following maker: {address}[/cyan]")
+    from rich.panel import Panel
+    
+    _status(f"Following maker: {address}", fg="cyan")
     if since_hours:
-        console.print(f"[cyan]Filtering trades from last {since_hours} hours[/cyan]")
+        _status(f"Filtering trades from last {since_hours} hours", fg="cyan")
     
-    client = BitqueryClient()
-    tracker = PositionTracker(client)
+    tracker = get_tracker()
     
     try:
-        positions = tracker.follow_trader_positions(
+        positions = tracker.iter_follow_trader_positions(
             maker_address=address,
             limit=limit,
             since_hours=since_hours
         )
+        first = next(positions, None)
         
-        if not positions:
-            console.print("[yellow]No positions found for this maker address.[/yellow]")
+        if first is None:
+            _status("No positions found for this maker address.", fg="yellow")
             return
         
+        # Keep running totals for the summary while rows stream in
+        total_positions = 0
+        total_volume = 0.0
+        assets = set()
+        
+        def tally(stream):
+            nonlocal total_positions, total_volume
+            for pos in stream:
+                total_positions += 1
+                total_volume += pos.amount * pos.price
+                assets.add(pos.asset_id)
+                yield pos
+        
         # Display positions
-        table = Table(title=f"Positions where {address} is Maker", box=box.ROUNDED, expand=True, show_header=True, width=None)
-        table.add_column("Maker", style="cyan", no_wrap=False, overflow="fold", min_width=20, max_width=20)
-        table.add_column("Taker", style="cyan", no_wrap=False, overflow="fold", min_width=20, max_width=20)
-        table.add_column("Asset ID", style="green", no_wrap=False, overflow="fold", min_width=20, max_width=20)
-        table.add_column("Amount", style="yellow", justify="right", min_width=10, max_width=10)
-        table.add_column("Price", style="magenta", justify="right", min_width=10, max_width=10)
-        table.add_column("Time", style="blue", min_width=19, max_width=19)
-        table.add_column("TX Hash", style="dim", no_wrap=False, overflow="fold", min_width=20, max_width=20)
-        
-        for pos in positions:
-            table.add_row(
-                pos.maker_address,
-                pos.taker_address,
-                pos.asset_id,
-                f"{pos.amount:.4f}",
-                f"{pos.price:.4f}",
-                pos.timestamp.strftime("%Y-%m-%d %H:%M:%S"),
-                pos.tx_hash
-            )
+        table = _make_positions_table(f"Positions where {address} is Maker")
         
-        console.print(table)
+        _stream_positions(table, tally(chain([first], positions)))
         
         # Display summary
-        total_volume = sum(p.amount * p.price for p in positions)
-        unique_assets = len(set(p.asset_id for p in positions))
+        unique_assets = len(assets)
         console.print()
         console.print(Panel(
-            f"[green]Total Positions:[/green] {len(positions)}\n"
+            f"[green]Total Positions:[/green] {total_positions}\n"
             f"[green]Total Volume:[/green] ${total_volume:.2f}\n"
             f"[green]Unique Assets:[/green] {unique_assets}",
             title="Summary",
@@ -147,7 +323,7 @@ def follow_trader(address: str, limit: int, since_hours: Optional[int]):
         ))
     
     except Exception as e:
-        console.print(f"[red]Error: {e}[/red]")
+        _status(f"Error: {e}", fg="red")
         raise click.Abort()
 
 @cli.command()
@@ -155,45 +331,27 @@ def follow_trader(address: str, limit: int, since_hours: Optional[int]):
 @click.option('--asset-id', '-a', help='Filter by asset ID')
 def list_trades(limit: int, asset_id: str):
     """List recent trades from Polymarket CTF Exchange."""
-    console.print("[cyan]Fetching recent trades...[/cyan]")
+    _status("Fetching recent trades...", fg="cyan")
     
-    client = BitqueryClient()
-    tracker = PositionTracker(client)
+    tracker = get_tracker()
     
     try:
         if asset_id:
-            positions = tracker.get_positions_by_asset(asset_id)
+            positions = iter(tracker.get_positions_by_asset(asset_id))
         else:
-            positions = tracker.get_recent_positions(limit=limit)
+            positions = tracker.iter_recent_positions(limit=limit)
+        first = next(positions, None)
         
-        if not positions:
-            console.print("[yellow]No trades found.[/yellow]")
+        if first is None:
+            _status("No trades found.", fg="yellow")
             return
         
-        table = Table(title="Recent Polymarket Trades", box=box.ROUNDED, expand=True, show_header=True, width=None)
-        table.add_column("Maker", style="cyan", no_wrap=False, overflow="fold", min_width=20, max_width=20)
-        table.add_column("Taker", style="cyan", no_wrap=False, overflow="fold", min_width=20, max_width=20)
-        table.add_column("Asset ID", style="green", no_wrap=False, overflow="fold", min_width=20, max_width=20)
-        table.add_column("Amount", style="yellow", justify="right", min_width=10, max_width=10)
-        table.add_column("Price", style="magenta", justify="right", min_width=10, max_width=10)
-        table.add_column("Time", style="blue", min_width=19, max_width=19)
-        table.add_column("TX Hash", style="dim", no_wrap=False, overflow="fold", min_width=20, max_width=20)
-        
-        for pos in positions:
-            table.add_row(
-                pos.maker_address,
-                pos.taker_address,
-                pos.asset_id,
-                f"{pos.amount:.4f}",
-                f"{pos.price:.4f}",
-                pos.timestamp.strftime("%Y-%m-%d %H:%M:%S"),
-                pos.tx_hash
-            )
+        table = _make_positions_table("Recent Polymarket Trades")
         
-        console.print(table)
+        _stream_positions(table, chain([first], positions))
     
     except Exception as e:
-        console.print(f"[red]Error: {e}[/red]")
+        _status(f"Error: {e}", fg="red")
         raise click.Abort()
 
 @cli.command()
@@ -201,21 +359,30 @@ def list_trades(limit: int, asset_id: str):
 @click.option('--fixed-amount', '-f', default=None, type=float, help='Fixed USD amount to spend (default: 0.001 from config)')
 @click.option('--execute', is_flag=True, help='Actually execute trade (requires private key)')
 @click.option('--skip-question-details', is_flag=True, help='Skip querying question details for faster execution')
-def copy_position(asset_id: str, fixed_amount: float, execute: bool, skip_question_details: bool):
+@click.option('--no-cache', is_flag=True, help='Ignore cached question details and responses and query Bitquery')
+def copy_position(asset_id: str, fixed_amount: float, execute: bool, skip_question_details: bool, no_cache: bool):
     """Copy a specific position by asset ID."""
+    from rich.panel import Panel
+    
     if not skip_question_details:
-        console.print(f"[cyan]Fetching question details for asset: {asset_id}[/cyan]")
+        _status(f"Fetching question details for asset: {asset_id}", fg="cyan")
     else:
-        console.print(f"[cyan]Copying position for asset: {asset_id}[/cyan]")
+        _status(f"Copying position for asset: {asset_id}", fg="cyan")
     
-    client = BitqueryClient()
-    tracker = PositionTracker(client)
+    tracker = get_tracker(fresh=no_cache)
     
     try:
-        # First, get and display question details (ancillary_data) unless skipped
+        # First, get and display question details (ancillary_data) unless skipped.
+        # The latest position is fetched in the same request as the first lookup.
+        latest_position = None
         if not skip_question_details:
-            console.print("[cyan]Fetching market question details...[/cyan]")
-            ancillary_data = tracker.get_question_details(asset_id)
+            _status("Fetching market question details...", fg="cyan")
+            cache_key = f"question_details:{str(asset_id).strip()}"
+            ancillary_data = None if no_cache else get_result_cache().get(cache_key)
+            if ancillary_data is None:
+                ancillary_data, latest_position = tracker.get_question_details_and_latest_position(asset_id)
+                if ancillary_data:
+                    get_result_cache().set(cache_key, ancillary_data, QUESTION_DETAILS_TTL)
             
             if ancillary_data:
                 # Display ancillary_data in a nice format
@@ -227,20 +394,18 @@ def copy_position(asset_id: str, fixed_amount: float, execute: bool, skip_questi
                 console.print(question_panel)
                 console.print()  # Add spacing
             else:
-                console.print("[yellow]Could not fetch question details. Continuing with position copy...[/yellow]")
+                _status("Could not fetch question details. Continuing with position copy...", fg="yellow")
                 console.print()
         
-        # Now get positions
-        console.print(f"[cyan]Fetching position data for asset: {asset_id}[/cyan]")
-        positions = tracker.get_positions_by_asset(asset_id)
+        # Now get the most recent position
+        if latest_position is None:
+            _status(f"Fetching position data for asset: {asset_id}", fg="cyan")
+            latest_position = tracker.get_latest_position_for_asset(asset_id)
         
-        if not positions:
-            console.print(f"[yellow]No positions found for asset ID: {asset_id}[/yellow]")
+        if not latest_position:
+            _status(f"No positions found for asset ID: {asset_id}", fg="yellow")
             return
         
-        # Use the most recent position
-        latest_position = max(positions, key=lambda p: p.timestamp)
-        
         console.print(Panel(
             f"[green]Asset ID:[/green] {latest_position.asset_id}\n"
             # f"[green]Trader:[/green] {latest_position.trader_address}\n"
@@ -256,24 +421,26 @@ def copy_position(asset_id: str, fixed_amount: float, execute: bool, skip_questi
         
     
     except Exception as e:
-        console.print(f"[red]Error: {e}[/red]")
+        _status(f"Error: {e}", fg="red")
         raise click.Abort()
 
 @cli.command()
 @click.option('--address', '-a', required=True, help='Trader wallet address')
-def trader_summary(address: str):
+@click.option('--positions', 'show_positions', is_flag=True, help='Also list the positions the summary is based on')
+def trader_summary(address: str, show_positions: bool):
     """Get summary statistics for a trader."""
-    console.print(f"[cyan]Analyzing trader: {address}[/cyan] in last 10k trades")
+    from rich.panel import Panel
+    
+    _status(f"Analyzing trader: {address} in last 10k trades", fg="cyan")
     
-    client = BitqueryClient()
-    tracker = PositionTracker(client)
+    tracker = get_tracker()
     
     try:
         # Track recent positions first
         positions = tracker.track_trader(address, limit=50)
         
         # Use the positions returned by track_trader directly
-        summary = tracker.get_trader_summary(address, positions=positions)
+        summary = tracker.get_trader_summary(address, positions=positions, include_positions=False)
         
         # Print address separately to ensure it's not truncated
         console.print(f"[green]Trader Address:[/green] {address}")
@@ -287,22 +454,35 @@ def trader_summary(address: str):
             title="Trader Summary",
             border_style="cyan"
         ))
+        
+        if show_positions and positions:
+            console.print()
+            rows = list(map(_position_row, positions))
+            table = _make_positions_table(f"Positions from {address}", rows)
+            _print_table(table, rows)
     
     except Exception as e:
-        console.print(f"[red]Error: {e}[/red]")
+        _status(f"Error: {e}", fg="red")
         raise click.Abort()
 
 @cli.command()
 @click.option('--asset-id', '-a', required=True, help='Asset ID')
-def market_price(asset_id: str):
+@click.option('--no-cache', is_flag=True, help=f'Ignore a price cached within the last {MARKET_PRICE_TTL}s and cached responses')
+def market_price(asset_id: str, no_cache: bool):
     """Get current market price for an asset."""
-    console.print(f"[cyan]Calculating market price for asset: {asset_id}[/cyan]")
+    from rich.panel import Panel
+    
+    _status(f"Calculating market price for asset: {asset_id}", fg="cyan")
     
-    client = BitqueryClient()
-    tracker = PositionTracker(client)
+    tracker = get_tracker(fresh=no_cache)
     
     try:
-        price = tracker.calculate_market_price(asset_id)
+        cache_key = f"market_price:{str(asset_id).strip()}"
+        price = None if no_cache else get_result_cache().get(cache_key)
+        if price is None:
+            price = tracker.calculate_market_price(asset_id)
+            if price:
+                get_result_cache().set(cache_key, price, MARKET_PRICE_TTL)
         
         if price:
             console.print(Panel(
@@ -312,10 +492,10 @@ def market_price(asset_id: str):
                 border_style="green"
             ))
         else:
-            console.print(f"[yellow]No recent trades found for this asset.[/yellow]")
+            _status(f"No recent trades found for this asset.", fg="yellow")
     
     except Exception as e:
-        console.print(f"[red]Error: {e}[/red]")
+        _status(f"Error: {e}", fg="red")
         raise click.Abort()
 
 @cli.command()
@@ -324,10 +504,12 @@ def market_price(asset_id: str):
 @click.option('--top-assets', '-a', default=20, help='Number of top assets to display (default: 20)')
 def top_traders(limit: int, top_traders: int, top_assets: int):
     """Display top traders and asset IDs based on trading volume."""
-    console.print(f"[cyan]Analyzing top traders and assets from {limit} trades...[/cyan]")
+    from rich import box
+    from rich.table import Table
+    
+    _status(f"Analyzing top traders and assets from {limit} trades...", fg="cyan")
     
-    client = BitqueryClient()
-    tracker = PositionTracker(client)
+    tracker = get_tracker()
     
     try:
         results = tracker.get_top_traders_and_assets(
@@ -336,10 +518,16 @@ def top_traders(limit: int, top_traders: int, top_assets: int):
             top_assets_count=top_assets
         )
         
-        console.print(f"\n[green]Analyzed {results['total_parsed']} trades from {results['total_trades']} events[/green]\n")
+        _status(f"\nAnalyzed {results['total_parsed']} trades from {results['total_trades']} events\n", fg="green")
         
         # Display top traders
         if results['traders']:
+            trader_fields = itemgetter('address', 'total_volume', 'total_trades', 'unique_assets_count', 'avg_price')
+            rows = [
+                (str(idx), address, f"${volume:.2f}", str(trades), str(unique), f"{price:.4f}")
+                for idx, (address, volume, trades, unique, price) in enumerate(map(trader_fields, results['traders']), 1)
+            ]
+            
             traders_table = Table(
                 title=f"Top {len(results['traders'])} Traders by Volume",
                 box=box.ROUNDED,
@@ -347,31 +535,28 @@ def top_traders(limit: int, top_traders: int, top_assets: int):
                 show_header=True,
                 width=None
             )
-            traders_table.add_column("Rank", style="cyan", justify="right", width=6)
-            traders_table.add_column("Address", style="cyan", no_wrap=False, overflow="fold", min_width=42, max_width=42)
-            traders_table.add_column("Total Volume (USD)", style="green", justify="right", min_width=18)
-            traders_table.add_column("Trades", style="yellow", justify="right", min_width=10)
-            traders_table.add_column("Unique Assets", style="magenta", justify="right", min_width=12)
-            traders_table.add_column("Avg Price", style="blue", justify="right", min_width=12)
-            
-            for idx, trader in enumerate(results['traders'], 1):
-                traders_table.add_row(
-                    str(idx),
-                    trader['address'],
-                    f"${trader['total_volume']:.2f}",
-                    str(trader['total_trades']),
-                    str(trader['unique_assets_count']),
-                    f"{trader['avg_price']:.4f}"
-                )
-            
-            console.print(traders_table)
+            _add_fitted_columns(traders_table, [
+                ("Rank", {"style": "cyan", "justify": "right"}),
+                ("Address", {"style": "cyan", "overflow": "fold"}),
+                ("Total Volume (USD)", {"style": "green", "justify": "right"}),
+                ("Trades", {"style": "yellow", "justify": "right"}),
+                ("Unique Assets", {"style": "magenta", "justify": "right"}),
+                ("Avg Price", {"style": "blue", "justify": "right"}),
+            ], rows)
+            _print_table(traders_table, rows)
         else:
-            console.print("[yellow]No traders found.[/yellow]")
+            _status("No traders found.", fg="yellow")
         
         console.print()  # Add spacing
         
         # Display top assets
         if results['assets']:
+            asset_fields = itemgetter('asset_id', 'total_volume', 'total_trades', 'unique_traders_count', 'avg_price')
+            rows = [
+                (str(idx), asset_id, f"${volume:.2f}", str(trades), str(unique), f"{price:.4f}")
+                for idx, (asset_id, volume, trades, unique, price) in enumerate(map(asset_fields, results['assets']), 1)
+            ]
+            
             assets_table = Table(
                 title=f"Top {len(results['assets'])} Assets by Volume",
                 box=box.ROUNDED,
@@ -379,31 +564,22 @@ def top_traders(limit: int, top_traders: int, top_assets: int):
                 show_header=True,
                 width=None
             )
-            assets_table.add_column("Rank", style="cyan", justify="right", width=6)
-            assets_table.add_column("Asset ID", style="cyan", no_wrap=False, overflow="fold", min_width=20, max_width=50)
-            assets_table.add_column("Total Volume (USD)", style="green", justify="right", min_width=18)
-            assets_table.add_column("Trades", style="yellow", justify="right", min_width=10)
-            assets_table.add_column("Unique Traders", style="magenta", justify="right", min_width=14)
-            assets_table.add_column("Avg Price", style="blue", justify="right", min_width=12)
-            
-            for idx, asset in enumerate(results['assets'], 1):
-                assets_table.add_row(
-                    str(idx),
-                    asset['asset_id'],
-                    f"${asset['total_volume']:.2f}",
-                    str(asset['total_trades']),
-                    str(asset['unique_traders_count']),
-                    f"{asset['avg_price']:.4f}"
-                )
-            
-            console.print(assets_table)
+            _add_fitted_columns(assets_table, [
+                ("Rank", {"style": "cyan", "justify": "right"}),
+                ("Asset ID", {"style": "cyan", "overflow": "fold"}),
+                ("Total Volume (USD)", {"style": "green", "justify": "right"}),
+                ("Trades", {"style": "yellow", "justify": "right"}),
+                ("Unique Traders", {"style": "magenta", "justify": "right"}),
+                ("Avg Price", {"style": "blue", "justify": "right"}),
+            ], rows)
+            _print_table(assets_table, rows)
         else:
-            console.print("[yellow]No assets found.[/yellow]")
+            _status("No assets found.", fg="yellow")
     
     except Exception as e:
-        console.print(f"[red]Error: {e}[/red]")
-        import traceback
-        traceback.print_exc()
+        _status(f"Error: {e}", fg="red")
+        if _debug:
+            traceback.print_exc()
         raise click.Abort()
 
 
@@ -417,41 +593,46 @@ def top_traders(limit: int, top_traders: int, top_assets: int):
     type=click.Path(dir_okay=False, writable=True, resolve_path=True),
     help="Also write a plain-text (no color codes) copy of the output to this file.",
 )
-def analyze_questions(limit: int, max_keywords: int, show_text: bool, log_file: str | None):
+@click.option("--no-cache", is_flag=True, help="Query Bitquery instead of reusing a recently cached response.")
+@click.option(
+    "--workers",
+    "-w",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Processes used to decode large batches (default: one per CPU; 1 disables).",
+)
+def analyze_questions(
+    limit: int,
+    max_keywords: int,
+    show_text: bool,
+    log_file: str | None,
+    no_cache: bool,
+    workers: int | None,
+):
     """Inspect UMA QuestionInitialized events and decode ancillaryData."""
-    client = BitqueryClient()
+    from rich.panel import Panel
+    from rich.table import Table
+    from question_analyzer import QuestionAnalyzer
+    
+    client = get_client(fresh=no_cache)
     analyzer = QuestionAnalyzer(max_keywords=max_keywords)
 
-    # Optional second console that writes plain text to a file
-    log_console = None
-    log_fp = None
+    # Record the output so it can be saved to the log file once at the end,
+    # reusing what was rendered for the terminal
     if log_file:
-        # No colors, no terminal control codes → human-readable log
-        log_fp = open(log_file, "w", encoding="utf-8")
-        log_console = Console(
-            file=log_fp,
-            force_terminal=False,
-            color_system=None,
-            width=None,
-        )
-
-    def _print(*args, **kwargs):
-        """Print to main console and (optionally) to log console."""
-        console.print(*args, **kwargs)
-        if log_console is not None:
-            log_console.print(*args, **kwargs)
+        console.record = True
 
     try:
-        _print(f"[cyan]Fetching last {limit} QuestionInitialized events...[/cyan]")
+        _status(f"Fetching last {limit} QuestionInitialized events...", fg="cyan")
         events = client.get_recent_question_initialized_events(limit=limit)
 
         if not events:
-            _print("[yellow]No QuestionInitialized events returned by Bitquery.[/yellow]")
+            _status("No QuestionInitialized events returned by Bitquery.", fg="yellow")
             raise click.Abort()
 
-        analyses = analyzer.analyze_events(events)
+        analyses = analyzer.analyze_events(events, workers=workers)
         if not analyses:
-            _print("[yellow]No events contained ancillaryData to decode.[/yellow]")
+            _status("No events contained ancillaryData to decode.", fg="yellow")
             raise click.Abort()
 
         table = Table(title="Question Analyzer", expand=True)
@@ -461,19 +642,26 @@ def analyze_questions(limit: int, max_keywords: int, show_text: bool, log_file:
         table.add_column("Keywords", style="green")
         table.add_column("Tx Hash", style="dim")
 
-        for analysis in analyses:
-            table.add_row(
+        rows = [
+            (
                 _format_time(analysis.block_time),
                 _shorten(analysis.question_id),
                 ", ".join(analysis.topics) if analysis.topics else "General",
                 ", ".join(analysis.keywords) if analysis.keywords else "—",
                 _shorten(analysis.tx_hash, length=16),
             )
-
-        _print(table)
+            for analysis in analyses
+        ]
+        _print_table(table, rows)
+        if log_file and not IS_TTY:
+            # The CSV bypassed the console; render the table (to stderr) so
+            # the log still holds it
+            for row in rows:
+                table.add_row(*row)
+            console.print(table)
 
         if show_text:
-            _print()
+            console.print()
             for analysis in analyses:
                 subtitle = []
                 if analysis.question_id:
@@ -486,7 +674,7 @@ def analyze_questions(limit: int, max_keywords: int, show_text: bool, log_file:
                     subtitle.append(f"Tx: {analysis.tx_hash}")
 
                 panel_title = " | ".join(subtitle) if subtitle else "Ancillary Data"
-                _print(
+                console.print(
                     Panel(
                         analysis.ancillary_text or "[dim]No ancillary text[/dim]",
                         title=panel_title,
@@ -494,8 +682,10 @@ def analyze_questions(limit: int, max_keywords: int, show_text: bool, log_file:
                     )
                 )
     finally:
-        if log_fp is not None:
-            log_fp.close()
+        if log_file:
+            # No colors, no terminal control codes → human-readable log
+            console.save_text(log_file)
+            console.record = False
 
 
 @cli.command(name="get-orderbook")
@@ -507,74 +697,79 @@ def get_orderbook(asset_id: str, limit: int):
     This shows what the orderbook looked like based on recent OrderFilled events.
     The orderbook is reconstructed chronologically, showing depth at each price level.
     """
-    console.print(f"[cyan]Reconstructing recent orderbook for asset: {asset_id}[/cyan]")
-    console.print("[dim]Note: This is reconstructed from completed trades, not live open orders[/dim]")
+    from rich import box
+    from rich.panel import Panel
+    from rich.table import Table
+    
+    _status(f"Reconstructing recent orderbook for asset: {asset_id}", fg="cyan")
+    _status("Note: This is reconstructed from completed trades, not live open orders", dim=True)
     
-    client = BitqueryClient()
-    tracker = PositionTracker(client)
+    tracker = get_tracker()
     
     try:
         orderbook = tracker.get_orderbook(asset_id, limit=limit)
         
         if not orderbook.get('bids') and not orderbook.get('asks'):
-            console.print(f"[yellow]No orderbook data found for asset ID: {asset_id}[/yellow]")
+            _status(f"No orderbook data found for asset ID: {asset_id}", fg="yellow")
             return
         
         # Display snapshot time if available
         if orderbook.get('snapshot_time'):
             snapshot_str = _format_time(orderbook['snapshot_time'])
-            console.print(f"[dim]Orderbook snapshot as of: {snapshot_str}[/dim]")
+            _status(f"Orderbook snapshot as of: {snapshot_str}", dim=True)
             console.print()
         
-        # Display bids table
-        if orderbook.get('bids'):
-            bids_table = Table(
-                title=f"Bids (Buy Orders) - Asset: {asset_id}",
-                box=box.ROUNDED,
-                expand=True,
-                show_header=True,
-                width=None
-            )
-            bids_table.add_column("Price", style="green", justify="right", min_width=12)
-            bids_table.add_column("Amount", style="yellow", justify="right", min_width=12)
-            bids_table.add_column("Count", style="cyan", justify="right", min_width=8)
-            
-            for bid in orderbook['bids']:
-                bids_table.add_row(
-                    f"{bid['price']:.4f}",
-                    f"{bid['amount']:.4f}",
-                    str(bid['count'])
+        if not IS_TTY:
+            # One CSV for both sides, so bids and asks stay distinguishable
+            writer = csv.writer(_csv_stdout)
+            writer.writerow(("Side", "Price", "Amount", "Count"))
+            for side, levels in (("bid", orderbook.get('bids')), ("ask", orderbook.get('asks'))):
+                writer.writerows(
+                    (side, f"{level['price']:.4f}", f"{level['amount']:.4f}", str(level['count']))
+                    for level in levels or ()
                 )
-            
-            console.print(bids_table)
         else:
-            console.print("[yellow]No bids found.[/yellow]")
-        
-        console.print()  # Add spacing
-        
-        # Display asks table
-        if orderbook.get('asks'):
-            asks_table = Table(
-                title=f"Asks (Sell Orders) - Asset: {asset_id}",
-                box=box.ROUNDED,
-                expand=True,
-                show_header=True,
-                width=None
-            )
-            asks_table.add_column("Price", style="red", justify="right", min_width=12)
-            asks_table.add_column("Amount", style="yellow", justify="right", min_width=12)
-            asks_table.add_column("Count", style="cyan", justify="right", min_width=8)
-            
-            for ask in orderbook['asks']:
-                asks_table.add_row(
-                    f"{ask['price']:.4f}",
-                    f"{ask['amount']:.4f}",
-                    str(ask['count'])
+            # Display bids table
+            if orderbook.get('bids'):
+                bids_table = Table(
+                    title=f"Bids (Buy Orders) - Asset: {asset_id}",
+                    box=box.ROUNDED,
+                    expand=True,
+                    show_header=True,
+                    width=None
                 )
+                bids_table.add_column("Price", style="green", justify="right", min_width=12)
+                bids_table.add_column("Amount", style="yellow", justify="right", min_width=12)
+                bids_table.add_column("Count", style="cyan", justify="right", min_width=8)
+                
+                _print_table(bids_table, (
+                    (f"{bid['price']:.4f}", f"{bid['amount']:.4f}", str(bid['count']))
+                    for bid in orderbook['bids']
+                ))
+            else:
+                _status("No bids found.", fg="yellow")
             
-            console.print(asks_table)
-        else:
-            console.print("[yellow]No asks found.[/yellow]")
+            console.print()  # Add spacing
+            
+            # Display asks table
+            if orderbook.get('asks'):
+                asks_table = Table(
+                    title=f"Asks (Sell Orders) - Asset: {asset_id}",
+                    box=box.ROUNDED,
+                    expand=True,
+                    show_header=True,
+                    width=None
+                )
+                asks_table.add_column("Price", style="red", justify="right", min_width=12)
+                asks_table.add_column("Amount", style="yellow", justify="right", min_width=12)
+                asks_table.add_column("Count", style="cyan", justify="right", min_width=8)
+                
+                _print_table(asks_table, (
+                    (f"{ask['price']:.4f}", f"{ask['amount']:.4f}", str(ask['count']))
+                    for ask in orderbook['asks']
+                ))
+            else:
+                _status("No asks found.", fg="yellow")
         
         # Display summary
         console.print()
@@ -594,7 +789,7 @@ def get_orderbook(asset_id: str, limit: int):
             ))
     
     except Exception as e:
-        console.print(f"[red]Error: {e}[/red]")
+        _status(f"Error: {e}", fg="red")
         raise click.Abort()
         
 if __name__ == '__main__':
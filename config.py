@@ -13,6 +13,7 @@ class Config:
     # Bitquery API
     OAUTH_TOKEN = os.getenv("OAUTH_TOKEN", "")
     BITQUERY_API_URL = os.getenv("BITQUERY_API_URL", "https://streaming.bitquery.io/graphql")
+    BITQUERY_HTTP2 = os.getenv("BITQUERY_HTTP2", "").strip().lower() in ("1", "true", "yes")  # needs httpx[http2]
     
     # Wallet auth
     SEED_PHRASE = os.getenv("SEED_PHRASE", "").strip()
@@ -43,6 +44,10 @@ class Config:
         "0x3c499c542cEF5E3811e1192ce70d8cC03d5c3359"  # Native USDC (default)
     )
     
+    # Local cache for immutable on-chain data (question index, etc.)
+    CACHE_DIR = Path(os.getenv("POLYMARKET_CACHE_DIR", "~/.cache/polymarket")).expanduser()
+    CACHE_TTL_SECONDS = int(os.getenv("CACHE_TTL_SECONDS", str(60 * 60 * 24 * 180)))  # question details
+    
     # Network
     NETWORK = "matic"
     DATASET = "realtime"  # or "combined" for historical
@@ -50,10 +55,19 @@ class Config:
     # Copy Trading Defaults
     DEFAULT_COPY_AMOUNT_USD = float(os.getenv("DEFAULT_COPY_AMOUNT_USD", "0.001"))  # Default: 0.001 USD per trade
     
+    _validated = False
+    
     @classmethod
     def validate(cls):
-        """Validate required configuration."""
+        """Validate required configuration.
+        
+        Only the first successful call does the checks; later calls (e.g. the
+        CLI group invoked repeatedly through click's CliRunner) return at once.
+        """
+        if cls._validated:
+            return True
         if not cls.OAUTH_TOKEN:
             raise ValueError("OAUTH_TOKEN is required in .env file")
+        cls._validated = True
         return True
 
@@ -1,7 +1,12 @@
 """Track and analyze positions from Polymarket trades."""
-from typing import List, Dict, Optional
+import heapq
+import sys
+import traceback
+from operator import itemgetter
+from typing import Dict, Iterator, List, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 from bitquery_client import BitqueryClient
 from processing import (
     extract_value,
@@ -9,9 +14,62 @@ from processing import (
     process_trade_amounts
 )
 
-@dataclass
+# Newest fills to fetch when only the latest position is needed
+LATEST_POSITION_LOOKAHEAD = 5
+
+# OrderFilled amount argument names -> priority (lower wins when several are present)
+_MAKER_AMOUNT_RANKS = {
+    name: rank
+    for rank, name in enumerate(("makerAmountFilled", "makerAmount", "makerFillAmount", "makerFilledAmount"))
+}
+_TAKER_AMOUNT_RANKS = {
+    name: rank
+    for rank, name in enumerate((
+        "takerAmountFilled", "takerAmount", "takerFillAmount", "takerFilledAmount", "fillAmount", "amount"
+    ))
+}
+_NO_RANK = len(_TAKER_AMOUNT_RANKS)
+
+# USDC's asset ID as Bitquery renders it (a bigInteger "0" or hex "0x0")
+_USDC_ASSET_IDS = frozenset(("0", "0x0"))
+
+# datetime.fromisoformat accepts a trailing "Z" from Python 3.11 on
+_FROMISOFORMAT_ACCEPTS_Z = sys.version_info >= (3, 11)
+
+
+@lru_cache(maxsize=4096)
+def _parse_block_time(value: str) -> datetime:
+    """Parse a Bitquery ``Block.Time``; fills in one block share a timestamp."""
+    if not _FROMISOFORMAT_ACCEPTS_Z and value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    return datetime.fromisoformat(value)
+
+
+def _event_has_address(event: Dict, address: str, names: Tuple[str, ...], include_sender: bool = False) -> bool:
+    """Cheap pre-parse check that one of the ``names`` arguments equals ``address``.
+    
+    ``address`` must already be lowercase. With ``include_sender`` the
+    transaction's ``From`` also counts, matching the trader fallback in
+    ``parse_order_filled_event``.
+    """
+    for arg in event.get("Arguments") or ():
+        if arg.get("Name") in names:
+            value = extract_string_value(arg.get("Value"))
+            if value and value.lower() == address:
+                return True
+    if include_sender:
+        sender = (event.get("Transaction") or {}).get("From")
+        return bool(sender) and sender.lower() == address
+    return False
+
+
+@dataclass(slots=True, frozen=True)
 class Position:
-    """Represents a trading position."""
+    """Represents a trading position.
+    
+    Addresses are lowercased and the asset ID stripped once by
+    ``parse_order_filled_event``, so they can be compared directly.
+    """
     asset_id: str
     trader_address: str
     maker_address: str
@@ -37,6 +95,34 @@ class Position:
             "tx_hash": self.tx_hash,
             "block_number": self.block_number
         }
+    
+    @staticmethod
+    def many_to_dict(positions: List["Position"]) -> List[Dict]:
+        """Convert positions to dictionaries, formatting each distinct timestamp once.
+        
+        Fills from the same block share a timestamp, so ``isoformat`` (the
+        bulk of ``to_dict``'s cost) is memoized across the batch.
+        """
+        iso_times: Dict[datetime, str] = {}
+        records = []
+        append = records.append
+        for p in positions:
+            timestamp = iso_times.get(p.timestamp)
+            if timestamp is None:
+                timestamp = iso_times[p.timestamp] = p.timestamp.isoformat()
+            append({
+                "asset_id": p.asset_id,
+                "trader_address": p.trader_address,
+                "maker_address": p.maker_address,
+                "taker_address": p.taker_address,
+                "amount": p.amount,
+                "price": p.price,
+                "direction": p.direction,
+                "timestamp": timestamp,
+                "tx_hash": p.tx_hash,
+                "block_number": p.block_number
+            })
+        return records
 
 class PositionTracker:
     """Track positions from OrderFilled events."""
@@ -62,37 +148,47 @@ class PositionTracker:
         try:
             args = event.get("Arguments", [])
             
-            # Extract arguments from event
-            arg_dict = {arg["Name"]: arg["Value"] for arg in args}
-            
-            # Extract asset IDs
+            # Extract arguments from event in a single pass. Amounts go by
+            # several names; the best-ranked name with a usable value wins,
+            # whatever order the arguments arrive in.
             maker_asset_id = None
             taker_asset_id = None
+            maker_amount = None
+            taker_amount = None
+            maker_rank = taker_rank = _NO_RANK
+            maker_ranks = _MAKER_AMOUNT_RANKS
+            taker_ranks = _TAKER_AMOUNT_RANKS
+            maker = None
+            taker = None
             
-            if "makerAssetId" in arg_dict:
-                value = arg_dict["makerAssetId"]
-                maker_asset_id_str = extract_string_value(value)
-                if maker_asset_id_str:
-                    maker_asset_id = maker_asset_id_str
-            
-            if "takerAssetId" in arg_dict:
-                value = arg_dict["takerAssetId"]
-                taker_asset_id_str = extract_string_value(value)
-                if taker_asset_id_str:
-                    taker_asset_id = taker_asset_id_str
+            for arg in args:
+                name = arg["Name"]
+                value = arg["Value"]
+                if name == "makerAssetId":
+                    maker_asset_id = (extract_string_value(value) or "").strip() or None
+                elif name == "takerAssetId":
+                    taker_asset_id = (extract_string_value(value) or "").strip() or None
+                elif name == "maker":
+                    maker = extract_string_value(value)
+                elif name == "taker":
+                    taker = extract_string_value(value)
+                elif name in maker_ranks:
+                    rank = maker_ranks[name]
+                    if rank < maker_rank:
+                        extracted = extract_value(value)
+                        if extracted is not None:
+                            maker_amount, maker_rank = extracted, rank
+                elif name in taker_ranks:
+                    rank = taker_ranks[name]
+                    if rank < taker_rank:
+                        extracted = extract_value(value)
+                        if extracted is not None:
+                            taker_amount, taker_rank = extracted, rank
             
             # Identify which is USDC (asset ID = "0") and which is the outcome token
-            # USDC asset ID is "0" (as a string or bigInteger)
-            usdc_asset_id_values = ["0", 0, "0x0"]
             outcome_asset_id = None
-            
-            # Check if maker asset ID is USDC
-            maker_is_usdc = (maker_asset_id in usdc_asset_id_values or 
-                           (maker_asset_id and str(maker_asset_id).strip() == "0"))
-            
-            # Check if taker asset ID is USDC
-            taker_is_usdc = (taker_asset_id in usdc_asset_id_values or 
-                           (taker_asset_id and str(taker_asset_id).strip() == "0"))
+            maker_is_usdc = maker_asset_id in _USDC_ASSET_IDS
+            taker_is_usdc = taker_asset_id in _USDC_ASSET_IDS
             
             if maker_is_usdc:
                 # Maker is giving USDC, taker is giving outcome tokens
@@ -114,23 +210,6 @@ class PositionTracker:
                 usdc_given = "taker"
                 tokens_received = "maker"
             
-            # Extract amounts - Polymarket uses makerAmountFilled and takerAmountFilled
-            maker_amount = None
-            taker_amount = None
-            
-            # Try the actual field names first
-            for key in ["makerAmountFilled", "makerAmount", "makerFillAmount", "makerFilledAmount"]:
-                if key in arg_dict:
-                    maker_amount = extract_value(arg_dict[key])
-                    if maker_amount is not None:
-                        break
-            
-            for key in ["takerAmountFilled", "takerAmount", "takerFillAmount", "takerFilledAmount", "fillAmount", "amount"]:
-                if key in arg_dict:
-                    taker_amount = extract_value(arg_dict[key])
-                    if taker_amount is not None:
-                        break
-            
             # Calculate USDC paid and tokens received based on which side is USDC
             usdc_paid = None
             tokens_amount = None
@@ -149,18 +228,11 @@ class PositionTracker:
                 # No amounts found
                 return None
             
-            # Extract trader addresses
-            maker = None
-            taker = None
-            
-            if "maker" in arg_dict:
-                maker = extract_string_value(arg_dict["maker"])
-                if maker:
-                    maker = maker.lower()  # Normalize to lowercase
-            if "taker" in arg_dict:
-                taker = extract_string_value(arg_dict["taker"])
-                if taker:
-                    taker = taker.lower()  # Normalize to lowercase
+            # Normalize trader addresses to lowercase
+            if maker:
+                maker = maker.lower()
+            if taker:
+                taker = taker.lower()
             
             # Determine trader: the one receiving outcome tokens (buying)
             # If maker gives USDC, taker is buying (receiving tokens)
@@ -189,13 +261,10 @@ class PositionTracker:
             tx = event.get("Transaction", {})
             
             timestamp_str = block.get("Time", "")
-            if timestamp_str:
-                timestamp = datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
-            else:
-                timestamp = datetime.now()
+            timestamp = _parse_block_time(timestamp_str) if timestamp_str else datetime.now()
             
             return Position(
-                asset_id=str(outcome_asset_id),
+                asset_id=outcome_asset_id,
                 trader_address=trader_address or "",
                 maker_address=maker or "",
                 taker_address=taker or "",
@@ -207,32 +276,74 @@ class PositionTracker:
                 block_number=block.get("Number", 0)
             )
         except Exception as e:
-            print(f"Error parsing event: {e}")
-            import traceback
-            traceback.print_exc()
+            # Any malformed event is skipped rather than aborting a multi-page
+            # scan; one line each (no traceback) keeps bulk scans fast
+            print(f"Error parsing event: {e!r}")
             return None
     
-    def track_trader(self, trader_address: str, limit: int = 10000) -> List[Position]:
-        """Track all positions from a specific trader."""
+    def iter_trader_positions(self, trader_address: str, limit: int = 10000) -> Iterator[Position]:
+        """Yield positions from a specific trader as their events are parsed."""
         # Normalize address to lowercase for consistent comparison
         trader_address_normalized = trader_address.lower() if trader_address else ""
         
-        events = self.client.get_order_filled_events_by_trader(
+        # Iterate lazily so the rest of the response is never parsed once
+        # we have enough positions
+        events = self.client.iter_order_filled_events_by_trader(
             trader_address=trader_address_normalized,
             limit=limit * 2  # Grab a few extra in case of malformed events
-        ) or []
+        )
         
-        positions = []
+        count = 0
         for event in events:
+            # Skip the full parse for fills the trader cannot be party to
+            if trader_address_normalized and not _event_has_address(
+                event, trader_address_normalized, ("maker", "taker"), include_sender=True
+            ):
+                continue
             position = self.parse_order_filled_event(event)
-            if position and position.trader_address.lower() == trader_address_normalized:
-                positions.append(position)
+            if position and position.trader_address == trader_address_normalized:
                 self.positions.append(position)
+                yield position
+                count += 1
                 # Stop once we have enough positions
-                if len(positions) >= limit:
+                if count >= limit:
                     break
+    
+    def track_trader(self, trader_address: str, limit: int = 10000) -> List[Position]:
+        """Track all positions from a specific trader."""
+        return list(self.iter_trader_positions(trader_address, limit=limit))
+    
+    def iter_follow_trader_positions(
+        self,
+        maker_address: str,
+        limit: int = 10000,
+        since_hours: Optional[int] = None
+    ) -> Iterator[Position]:
+        """Yield positions where a specific address is the maker as their events are parsed."""
+        # Normalize address to lowercase for consistent comparison
+        maker_address_normalized = maker_address.lower() if maker_address else ""
         
-        return positions
+        if not maker_address_normalized:
+            return
+        
+        events = self.client.iter_follow_trader(
+            maker_address=maker_address_normalized,
+            limit=limit * 2,  # Grab a few extra in case of malformed events
+            since_hours=since_hours
+        )
+        
+        count = 0
+        for event in events:
+            if not _event_has_address(event, maker_address_normalized, ("maker",)):
+                continue
+            position = self.parse_order_filled_event(event)
+            if position and position.maker_address == maker_address_normalized:
+                self.positions.append(position)
+                yield position
+                count += 1
+                # Stop once we have enough positions
+                if count >= limit:
+                    break
     
     def follow_trader_positions(self, maker_address: str, limit: int = 10000, since_hours: Optional[int] = None) -> List[Position]:
         """Follow positions where a specific address is the maker.
@@ -249,29 +360,15 @@ class PositionTracker:
         Returns:
             List of Position objects where maker address matches
         """
-        # Normalize address to lowercase for consistent comparison
-        maker_address_normalized = maker_address.lower() if maker_address else ""
-        
-        if not maker_address_normalized:
-            return []
-        
-        events = self.client.follow_trader(
-            maker_address=maker_address_normalized,
-            limit=limit * 2,  # Grab a few extra in case of malformed events
-            since_hours=since_hours
-        ) or []
-        
-        positions = []
-        for event in events:
+        return list(self.iter_follow_trader_positions(maker_address, limit=limit, since_hours=since_hours))
+    
+    def iter_recent_positions(self, limit: int = 20) -> Iterator[Position]:
+        """Yield recent positions from all traders as their events arrive."""
+        for event in self.client.iter_order_filled_events(limit=limit):
             position = self.parse_order_filled_event(event)
-            if position and position.maker_address.lower() == maker_address_normalized:
-                positions.append(position)
+            if position:
                 self.positions.append(position)
-                # Stop once we have enough positions
-                if len(positions) >= limit:
-                    break
-        
-        return positions
+                yield position
     
     def get_recent_positions(self, limit: int = 20) -> List[Position]:
         """Get recent positions from all traders."""
@@ -302,20 +399,27 @@ class PositionTracker:
         print(f"PositionTracker: Successfully parsed {len(positions)} positions from {len(events)} events")
         return positions
     
-    def get_positions_by_asset(self, asset_id: str) -> List[Position]:
+    def get_positions_by_asset(
+        self,
+        asset_id: str,
+        events: Optional[List[Dict]] = None,
+        limit: int = 100
+    ) -> List[Position]:
         """Get all positions for a specific asset ID.
         
         Uses a dedicated query method that filters OrderFilled events by asset ID
-        directly in the GraphQL query for better performance.
+        directly in the GraphQL query for better performance. Pass ``events``
+        to parse already-fetched OrderFilled events instead.
         """
         # Normalize asset_id for comparison (strip whitespace, ensure string)
         asset_id_normalized = str(asset_id).strip()
         
         # Use the new method that filters by asset ID in the query
-        events = self.client.get_order_filled_events_by_asset_id(
-            asset_id=asset_id_normalized,
-            limit=100
-        )
+        if events is None:
+            events = self.client.get_order_filled_events_by_asset_id(
+                asset_id=asset_id_normalized,
+                limit=limit
+            )
         
         # Handle case where events might be None
         if events is None:
@@ -323,39 +427,65 @@ class PositionTracker:
         
         print(f"PositionTracker: Found {len(events)} OrderFilled events for asset ID {asset_id_normalized}")
         
-        positions = []
-        for event in events:
-            position = self.parse_order_filled_event(event)
-            if position:
-                # Double-check that the asset ID matches (should already be filtered by query)
-                position_asset_id = str(position.asset_id).strip()
-                if position_asset_id == asset_id_normalized:
-                    positions.append(position)
+        positions = list(self._iter_asset_positions(asset_id_normalized, events))
         
         print(f"PositionTracker: Parsed {len(positions)} positions for asset ID {asset_id_normalized}")
         
         return positions
     
+    def _iter_asset_positions(self, asset_id_normalized: str, events: List[Dict]) -> Iterator[Position]:
+        """Yield parsed positions from ``events`` that belong to the asset, in order."""
+        for event in events:
+            position = self.parse_order_filled_event(event)
+            # Double-check that the asset ID matches (should already be filtered by query)
+            if position and position.asset_id == asset_id_normalized:
+                yield position
+    
+    def get_latest_position_for_asset(
+        self,
+        asset_id: str,
+        events: Optional[List[Dict]] = None
+    ) -> Optional[Position]:
+        """Get the most recent position for an asset ID.
+        
+        The query already returns fills newest first, so only the first few
+        are requested (a handful, in case the newest ones fail to parse) and
+        parsing stops at the first one that belongs to the asset.
+        """
+        asset_id_normalized = str(asset_id).strip()
+        if events is None:
+            events = self.client.get_order_filled_events_by_asset_id(
+                asset_id=asset_id_normalized,
+                limit=LATEST_POSITION_LOOKAHEAD
+            )
+        return next(self._iter_asset_positions(asset_id_normalized, events or []), None)
+    
     def calculate_market_price(self, asset_id: str) -> Optional[float]:
         """Calculate current market price from recent OrderFilled events."""
-        positions = self.get_positions_by_asset(asset_id)
+        latest_position = self.get_latest_position_for_asset(asset_id)
         
-        if not positions:
+        if not latest_position:
             return None
         
         # Use most recent position price
-        latest_position = max(positions, key=lambda p: p.timestamp)
         return latest_position.price
     
-    def get_trader_summary(self, trader_address: str, positions: Optional[List[Position]] = None) -> Dict:
+    def get_trader_summary(
+        self,
+        trader_address: str,
+        positions: Optional[List[Position]] = None,
+        include_positions: bool = True
+    ) -> Dict:
         """Get summary statistics for a trader.
         
         Args:
             trader_address: The trader address to summarize
             positions: Optional list of positions to use. If not provided, filters from self.positions.
+            include_positions: Whether to add the serialized positions under "positions"
         """
         if positions is None:
-            positions = [p for p in self.positions if p.trader_address.lower() == trader_address.lower()]
+            target = trader_address.lower()
+            positions = [p for p in self.positions if p.trader_address == target]
         
         if not positions:
             return {
@@ -366,20 +496,50 @@ class PositionTracker:
                 "unique_assets": 0
             }
         
-        total_volume = sum(p.amount * p.price for p in positions)
-        avg_price = sum(p.price for p in positions) / len(positions)
-        unique_assets = len(set(p.asset_id for p in positions))
-        
-        return {
+        # One pass for all three aggregates
+        total_volume = 0.0
+        total_price = 0.0
+        assets = set()
+        for p in positions:
+            total_volume += p.amount * p.price
+            total_price += p.price
+            assets.add(p.asset_id)
+        avg_price = total_price / len(positions)
+        unique_assets = len(assets)
+        
+        summary = {
             "trader": trader_address,
             "total_positions": len(positions),
             "total_volume": total_volume,
             "avg_price": avg_price,
-            "unique_assets": unique_assets,
-            "positions": [p.to_dict() for p in positions]
+            "unique_assets": unique_assets
         }
+        if include_positions:
+            summary["positions"] = Position.many_to_dict(positions)
+        return summary
     
-    def get_question_details(self, asset_id: str) -> Optional[str]:
+    def get_question_details_and_latest_position(self, asset_id: str) -> Tuple[Optional[str], Optional[Position]]:
+        """Get question details and the latest position for an asset, batching the independent queries.
+        
+        The TokenRegistered lookup (step 1 of ``get_question_details``) and the
+        asset's latest OrderFilled events do not depend on each other, so they
+        are sent in a single request; the remaining question lookups and the
+        position parse then run in sequence. If the batched request fails,
+        each lookup falls back to its own query.
+        
+        Returns:
+            Tuple of (decoded ancillary_data or None, latest position or None)
+        """
+        asset_id_normalized = str(asset_id).strip()
+        token_events, order_events = self.client.batch(
+            ("TokenRegisteredByAsset", {"asset_id": asset_id_normalized, "limit": 10, "since_days": 10}),
+            ("OrderFilledEventsByAsset", {"asset_id": asset_id_normalized, "limit": LATEST_POSITION_LOOKAHEAD}),
+        )
+        details = self.get_question_details(asset_id, token_events=token_events)
+        latest_position = self.get_latest_position_for_asset(asset_id, events=order_events)
+        return details, latest_position
+    
+    def get_question_details(self, asset_id: str, token_events: Optional[List[Dict]] = None) -> Optional[str]:
         """Get question details by running 3 queries in sequence:
         1. Query TokenRegistered events by asset ID to get conditionId
         2. Query QuestionInitialized/ConditionPreparation events by conditionId to get questionId
@@ -387,14 +547,16 @@ class PositionTracker:
         
         Args:
             asset_id: The asset ID to look up
+            token_events: Already-fetched TokenRegistered events, to skip step 1
             
         Returns:
             Decoded ancillary_data string, or None if not found
         """
         try:
             # Step 1: Query TokenRegistered events by asset ID to get conditionId
-            print(f"Step 1: Querying TokenRegistered events for asset ID: {asset_id}")
-            token_events = self.client.get_token_registered_by_asset_id(asset_id, limit=10, since_days=10)
+            if token_events is None:
+                print(f"Step 1: Querying TokenRegistered events for asset ID: {asset_id}")
+                token_events = self.client.get_token_registered_by_asset_id(asset_id, limit=10, since_days=10)
             
             if not token_events:
                 print(f"No TokenRegistered events found for asset ID: {asset_id}")
@@ -535,7 +697,6 @@ class PositionTracker:
             
         except Exception as e:
             print(f"Error getting question details: {e}")
-            import traceback
             traceback.print_exc()
             return None
     
@@ -561,10 +722,64 @@ class PositionTracker:
         """
         print(f"Fetching {limit} trades...")
         
-        # Fetch events
-        events = self.client.get_order_filled_events(limit=limit)
+        # Bitquery cannot aggregate over event arguments, so stream the trades
+        # and fold each one into the running totals instead of holding every
+        # event and parsed position in memory. One request covers the whole
+        # limit (events are still parsed as they arrive); paging it would add
+        # a sequential round trip per page.
+        total_trades = 0
+        total_parsed = 0
+        trader_stats = {}
+        asset_stats = {}
+        for event in self.client.iter_order_filled_events(limit=limit, page_size=limit):
+            total_trades += 1
+            pos = self.parse_order_filled_event(event)
+            if not pos:
+                continue
+            total_parsed += 1
+            
+            amount = pos.amount
+            volume = amount * pos.price
+            trader = pos.trader_address
+            
+            # Aggregate by trader (look each stats dict up once per trade)
+            if trader:
+                stats = trader_stats.get(trader)
+                if stats is None:
+                    stats = trader_stats[trader] = {
+                        "address": trader,
+                        "total_volume": 0.0,
+                        "total_trades": 0,
+                        "unique_assets": set(),
+                        "avg_price": 0.0,
+                        "total_amount": 0.0
+                    }
+                
+                stats["total_volume"] += volume
+                stats["total_trades"] += 1
+                stats["unique_assets"].add(pos.asset_id)
+                stats["total_amount"] += amount
+            
+            # Aggregate by asset ID
+            asset_id = pos.asset_id
+            if asset_id:
+                stats = asset_stats.get(asset_id)
+                if stats is None:
+                    stats = asset_stats[asset_id] = {
+                        "asset_id": asset_id,
+                        "total_volume": 0.0,
+                        "total_trades": 0,
+                        "unique_traders": set(),
+                        "avg_price": 0.0,
+                        "total_amount": 0.0
+                    }
+                
+                stats["total_volume"] += volume
+                stats["total_trades"] += 1
+                stats["unique_traders"].add(trader)
+                stats["total_amount"] += amount
         
-        if not events:
+        if not total_trades:
             return {
                 "traders": [],
                 "assets": [],
@@ -572,103 +787,41 @@ class PositionTracker:
                 "total_parsed": 0
             }
         
-        # Parse all events into positions
-        positions = []
-        for event in events:
-            position = self.parse_order_filled_event(event)
-            if position:
-                positions.append(position)
-        
-        print(f"Successfully parsed {len(positions)} positions from {len(events)} events")
+        print(f"Successfully parsed {total_parsed} positions from {total_trades} events")
         
-        # Aggregate by trader
-        trader_stats = {}
-        for pos in positions:
-            trader = pos.trader_address.lower()
-            if not trader:
-                continue
-            
-            if trader not in trader_stats:
-                trader_stats[trader] = {
-                    "address": trader,
-                    "total_volume": 0.0,
-                    "total_trades": 0,
-                    "unique_assets": set(),
-                    "avg_price": 0.0,
-                    "total_amount": 0.0
-                }
-            
-            volume = pos.amount * pos.price
-            trader_stats[trader]["total_volume"] += volume
-            trader_stats[trader]["total_trades"] += 1
-            trader_stats[trader]["unique_assets"].add(pos.asset_id)
-            trader_stats[trader]["total_amount"] += pos.amount
+        # Rank first (heapq.nlargest is O(N log k) and matches
+        # sorted(..., reverse=True)[:k], ties included), then finish only
+        # the stats that will be returned
+        volume_key = itemgetter("total_volume")
+        top_traders = heapq.nlargest(top_traders_count, trader_stats.values(), key=volume_key)
+        top_assets = heapq.nlargest(top_assets_count, asset_stats.values(), key=volume_key)
         
         # Convert sets to counts and calculate averages
-        for trader in trader_stats:
-            stats = trader_stats[trader]
+        for stats in top_traders:
             stats["unique_assets_count"] = len(stats["unique_assets"])
             stats["unique_assets"] = list(stats["unique_assets"])[:10]  # Keep first 10 for display
             if stats["total_trades"] > 0:
                 stats["avg_price"] = stats["total_volume"] / stats["total_amount"] if stats["total_amount"] > 0 else 0.0
         
-        # Aggregate by asset ID
-        asset_stats = {}
-        for pos in positions:
-            asset_id = str(pos.asset_id).strip()
-            if not asset_id:
-                continue
-            
-            if asset_id not in asset_stats:
-                asset_stats[asset_id] = {
-                    "asset_id": asset_id,
-                    "total_volume": 0.0,
-                    "total_trades": 0,
-                    "unique_traders": set(),
-                    "avg_price": 0.0,
-                    "total_amount": 0.0
-                }
-            
-            volume = pos.amount * pos.price
-            asset_stats[asset_id]["total_volume"] += volume
-            asset_stats[asset_id]["total_trades"] += 1
-            asset_stats[asset_id]["unique_traders"].add(pos.trader_address.lower())
-            asset_stats[asset_id]["total_amount"] += pos.amount
-        
         # Convert sets to counts and calculate averages
-        for asset_id in asset_stats:
-            stats = asset_stats[asset_id]
+        for stats in top_assets:
             stats["unique_traders_count"] = len(stats["unique_traders"])
             if stats["total_trades"] > 0:
                 stats["avg_price"] = stats["total_volume"] / stats["total_amount"] if stats["total_amount"] > 0 else 0.0
         
-        # Sort traders by total volume (descending)
-        top_traders = sorted(
-            trader_stats.values(),
-            key=lambda x: x["total_volume"],
-            reverse=True
-        )[:top_traders_count]
-        
-        # Sort assets by total volume (descending)
-        top_assets = sorted(
-            asset_stats.values(),
-            key=lambda x: x["total_volume"],
-            reverse=True
-        )[:top_assets_count]
-        
         return {
             "traders": top_traders,
             "assets": top_assets,
-            "total_trades": len(events),
-            "total_parsed": len(positions)
+            "total_trades": total_trades,
+            "total_parsed": total_parsed
         }
 
     def get_orderbook(self, asset_id: str, limit: int = 200) -> Dict:
         """Reconstruct recent orderbook snapshot from recent order filled events.
         
         This method reconstructs what the orderbook looked like based on completed trades.
-        It processes trades chronologically (oldest first) to build up orderbook depth,
-        showing the state as of the most recent trade.
+        It aggregates trade depth per price level in a single pass (the totals do not
+        depend on trade order), showing the state as of the most recent trade.
         
         Args:
             asset_id: The asset ID to get orderbook for
@@ -689,10 +842,11 @@ class PositionTracker:
             }
         
         # Parse events into positions
+        asset_id_normalized = str(asset_id).strip()
         positions = []
         for event in events:
             position = self.parse_order_filled_event(event)
-            if position and str(position.asset_id).strip() == str(asset_id).strip():
+            if position and position.asset_id == asset_id_normalized:
                 positions.append(position)
         
         if not positions:
@@ -703,69 +857,62 @@ class PositionTracker:
                 "snapshot_time": None
             }
         
-        # Sort positions chronologically (oldest first) to build orderbook over time
-        positions.sort(key=lambda p: p.timestamp)
-        
         # Track orderbook depth at each price level
         # Bids: buy orders (what buyers were willing to pay)
         # Asks: sell orders (what sellers were willing to accept)
-        bid_levels = {}  # price -> {amount, count, last_trade_time}
-        ask_levels = {}  # price -> {amount, count, last_trade_time}
+        bid_levels: Dict[float, Tuple[float, int, datetime]] = {}  # price -> (amount, count, last_trade_time)
+        ask_levels: Dict[float, Tuple[float, int, datetime]] = {}  # price -> (amount, count, last_trade_time)
         
-        # Process each trade chronologically to build up orderbook depth
+        # Process each trade once to build up orderbook depth (order-independent)
         for position in positions:
             price = position.price
             amount = position.amount
+            timestamp = position.timestamp
             
-            # Determine buyer and seller
+            # Determine buyer and seller (addresses are already lowercase)
             buyer_address = position.trader_address  # The one receiving tokens (buying)
+            maker_address = position.maker_address
+            taker_address = position.taker_address
             
-            # Determine seller: the party that is NOT the buyer
+            # Determine seller: the party that is NOT the buyer. The maker sells
+            # unless it is the buyer, which also covers an unknown buyer.
             seller_address = None
-            if position.maker_address and position.taker_address:
-                if buyer_address:
-                    buyer_lower = buyer_address.lower()
-                    maker_lower = position.maker_address.lower()
-                    taker_lower = position.taker_address.lower()
-                    
-                    if buyer_lower == maker_lower:
-                        seller_address = position.taker_address
-                    elif buyer_lower == taker_lower:
-                        seller_address = position.maker_address
-                    else:
-                        # Fallback: use the non-buyer address
-                        seller_address = position.maker_address if maker_lower != buyer_lower else position.taker_address
-                else:
-                    # If no buyer identified, use maker as seller (fallback)
-                    seller_address = position.maker_address
+            if maker_address and taker_address:
+                seller_address = taker_address if buyer_address == maker_address else maker_address
             
             # Add to bids: buyer's willingness to pay at this price
             if buyer_address:
-                if price not in bid_levels:
-                    bid_levels[price] = {"amount": 0.0, "count": 0, "last_trade_time": position.timestamp}
-                bid_levels[price]["amount"] += amount
-                bid_levels[price]["count"] += 1
-                # Update to most recent trade time at this price level
-                if position.timestamp > bid_levels[price]["last_trade_time"]:
-                    bid_levels[price]["last_trade_time"] = position.timestamp
+                level = bid_levels.get(price)
+                if level is None:
+                    bid_levels[price] = (amount, 1, timestamp)
+                else:
+                    # Keep the most recent trade time at this price level
+                    bid_levels[price] = (
+                        level[0] + amount,
+                        level[1] + 1,
+                        timestamp if timestamp > level[2] else level[2],
+                    )
             
             # Add to asks: seller's willingness to accept at this price
             if seller_address:
-                if price not in ask_levels:
-                    ask_levels[price] = {"amount": 0.0, "count": 0, "last_trade_time": position.timestamp}
-                ask_levels[price]["amount"] += amount
-                ask_levels[price]["count"] += 1
-                # Update to most recent trade time at this price level
-                if position.timestamp > ask_levels[price]["last_trade_time"]:
-                    ask_levels[price]["last_trade_time"] = position.timestamp
+                level = ask_levels.get(price)
+                if level is None:
+                    ask_levels[price] = (amount, 1, timestamp)
+                else:
+                    # Keep the most recent trade time at this price level
+                    ask_levels[price] = (
+                        level[0] + amount,
+                        level[1] + 1,
+                        timestamp if timestamp > level[2] else level[2],
+                    )
         
         # Convert to sorted lists for display
         # Bids: sorted by price descending (highest bid first) - best bid at top
         bids = [
             {
                 "price": price,
-                "amount": level["amount"],
-                "count": level["count"]
+                "amount": level[0],
+                "count": level[1]
             }
             for price, level in sorted(bid_levels.items(), reverse=True)
         ]
@@ -774,8 +921,8 @@ class PositionTracker:
         asks = [
             {
                 "price": price,
-                "amount": level["amount"],
-                "count": level["count"]
+                "amount": level[0],
+                "count": level[1]
             }
             for price, level in sorted(ask_levels.items())
         ]
@@ -1,11 +1,12 @@
 """Utility helpers for normalizing Bitquery argument values."""
 from __future__ import annotations
 
-from decimal import Decimal, InvalidOperation
-from typing import Any, Optional, Tuple
+from typing import Any, Optional, Tuple, Union
 
-USDC_DECIMALS = Decimal("1e6")
-TOKEN_DECIMALS = Decimal("1e6")
+# Amounts are integer base units; int / int true division is correctly
+# rounded, so no Decimal arithmetic is needed to normalize them
+USDC_DECIMALS = 1_000_000
+TOKEN_DECIMALS = 1_000_000
 
 
 def _resolve_value(value: Any) -> Any:
@@ -17,33 +18,35 @@ def _resolve_value(value: Any) -> Any:
     return value
 
 
-def _to_decimal(value: Any) -> Optional[Decimal]:
+def _to_number(value: Any) -> Optional[Union[int, float]]:
     if value is None:
         return None
-    if isinstance(value, Decimal):
-        return value
     if isinstance(value, (int, float)):
-        return Decimal(str(value))
+        return value
     if isinstance(value, str):
         cleaned = value.strip()
         if not cleaned:
             return None
         if cleaned.startswith("0x"):
             try:
-                return Decimal(int(cleaned, 16))
+                return int(cleaned, 16)
             except ValueError:
                 return None
         try:
-            return Decimal(cleaned)
-        except InvalidOperation:
+            return int(cleaned)
+        except ValueError:
+            pass
+        try:
+            return float(cleaned)
+        except ValueError:
             return None
     return None
 
 
-def extract_value(value_dict: Any) -> Optional[Decimal]:
+def extract_value(value_dict: Any) -> Optional[Union[int, float]]:
     """Extract numeric values from Bitquery argument formats."""
     resolved = _resolve_value(value_dict)
-    return _to_decimal(resolved)
+    return _to_number(resolved)
 
 
 def extract_string_value(value_dict: Any) -> Optional[str]:
@@ -58,12 +61,11 @@ def extract_string_value(value_dict: Any) -> Optional[str]:
 
 def process_trade_amounts(usdc_paid: Any, tokens_amount: Any) -> Tuple[float, float, float]:
     """Normalize USDC/token amounts and derive price."""
-    usdc_value = _to_decimal(_resolve_value(usdc_paid)) or Decimal(0)
-    token_value = _to_decimal(_resolve_value(tokens_amount)) or Decimal(0)
+    usdc_value = _to_number(_resolve_value(usdc_paid)) or 0
+    token_value = _to_number(_resolve_value(tokens_amount)) or 0
 
-    usdc_normalized = float(usdc_value / USDC_DECIMALS) if usdc_value else 0.0
-    tokens_normalized = float(token_value / TOKEN_DECIMALS) if token_value else 0.0
+    usdc_normalized = usdc_value / USDC_DECIMALS if usdc_value else 0.0
+    tokens_normalized = token_value / TOKEN_DECIMALS if token_value else 0.0
 
     price = (usdc_normalized / tokens_normalized) if tokens_normalized else 0.0
     return usdc_normalized, tokens_normalized, price
-
@@ -3,9 +3,35 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, List, Optional
-from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import binascii
+import os
 import re
+import sys
+
+# Below this many events a process pool costs more to start than it saves
+PARALLEL_THRESHOLD = 500
+
+# datetime.fromisoformat accepts a trailing "Z" from Python 3.11 on
+_FROMISOFORMAT_ACCEPTS_Z = sys.version_info >= (3, 11)
+
+# Decoded payloads kept per analyzer; replayed questions skip re-analysis
+CONTENT_CACHE_SIZE = 4096
+
+# Bitquery argument value fields, in the order they are preferred
+_ARGUMENT_VALUE_KEYS = ("string", "hex", "bigInteger", "integer", "address", "bool")
+
+
+def _index_keywords(topic_keywords: Dict[str, List[str]]) -> Dict[str, Tuple[int, ...]]:
+    """Invert ``topic -> keywords`` into ``keyword -> topic positions``."""
+    index: Dict[str, Tuple[int, ...]] = {}
+    for position, keywords in enumerate(topic_keywords.values()):
+        for keyword in dict.fromkeys(keywords):
+            index[keyword] = index.get(keyword, ()) + (position,)
+    return index
 
 
 @dataclass
@@ -25,7 +51,7 @@ class QuestionAnalysis:
 class QuestionAnalyzer:
     """Decode ancillaryData payloads and summarize their content."""
 
-    _STOPWORDS = {
+    _STOPWORDS = frozenset({
         "the",
         "and",
         "for",
@@ -95,7 +121,7 @@ class QuestionAnalyzer:
         "https",
         "http",
         "market_id",
-    }
+    })
 
     _TOPIC_KEYWORDS: Dict[str, List[str]] = {
         "Politics": [
@@ -220,6 +246,10 @@ class QuestionAnalyzer:
         ],
     }
 
+    # Topic scoring walks the text's tokens once against this inverted index
+    _TOPIC_NAMES = tuple(_TOPIC_KEYWORDS)
+    _KEYWORD_TOPICS = _index_keywords(_TOPIC_KEYWORDS)
+
     _WORD_PATTERN = re.compile(r"[A-Za-z0-9][A-Za-z0-9']+")
 
     _FIELD_PATTERNS = {
@@ -235,15 +265,26 @@ class QuestionAnalyzer:
 
     def __init__(self, max_keywords: int = 8):
         self.max_keywords = max_keywords
-
-    def analyze_events(self, events: List[Dict[str, Any]]) -> List[QuestionAnalysis]:
-        """Convert raw Bitquery events into structured analyses."""
-        analyses: List[QuestionAnalysis] = []
-        for event in events:
-            analysis = self._analyze_single_event(event)
-            if analysis:
-                analyses.append(analysis)
-        return analyses
+        # ancillaryData hex -> (text, topics, keywords), least recently used first
+        self._content_cache: OrderedDict[str, Tuple[str, Tuple[str, ...], Tuple[str, ...]]] = OrderedDict()
+
+    def analyze_events(
+        self, events: List[Dict[str, Any]], workers: Optional[int] = None
+    ) -> List[QuestionAnalysis]:
+        """Convert raw Bitquery events into structured analyses.
+
+        Large batches are decoded across a process pool of ``workers``
+        processes (default: one per CPU; ``1`` decodes in-process), since
+        keyword and topic extraction is pure-Python CPU work; results keep
+        event order.
+        """
+        workers = workers or os.cpu_count() or 1
+        if len(events) >= PARALLEL_THRESHOLD and workers > 1:
+            chunksize = max(1, len(events) // (4 * workers))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = executor.map(self._analyze_single_event, events, chunksize=chunksize)
+                return [analysis for analysis in results if analysis]
+        return [analysis for analysis in map(self._analyze_single_event, events) if analysis]
 
     def _analyze_single_event(self, event: Dict[str, Any]) -> Optional[QuestionAnalysis]:
         arguments = self._normalize_arguments(event.get("Arguments", []))
@@ -251,9 +292,7 @@ class QuestionAnalyzer:
         if not ancillary_hex:
             return None
 
-        ancillary_text = self._decode_ancillary_data(ancillary_hex)
-        topics = self._detect_topics(ancillary_text)
-        keywords = self._extract_keywords(ancillary_text)
+        ancillary_text, topics, keywords = self._analyze_content(ancillary_hex)
 
         block_info = event.get("Block") or {}
         block_time = self._parse_time(block_info.get("Time"))
@@ -261,13 +300,42 @@ class QuestionAnalyzer:
         return QuestionAnalysis(
             question_id=arguments.get("questionID"),
             condition_id=arguments.get("conditionId"),
-            ancillary_text=ancillary_text.strip(),
+            ancillary_text=ancillary_text,
             block_time=block_time,
             block_number=block_info.get("Number"),
             tx_hash=(event.get("Transaction") or {}).get("Hash"),
-            topics=topics,
-            keywords=keywords,
+            topics=list(topics),
+            keywords=list(keywords),
+        )
+
+    def _analyze_content(self, ancillary_hex: str) -> Tuple[str, Tuple[str, ...], Tuple[str, ...]]:
+        """Decode and categorize an ancillaryData payload, reusing prior results.
+
+        Replayed QuestionInitialized events (backfills, reorgs) carry the same
+        payload; only the block and transaction fields differ per event.
+        """
+        cache = self._content_cache
+        content = cache.get(ancillary_hex)
+        if content is not None:
+            cache.move_to_end(ancillary_hex)
+            return content
+
+        ancillary_text = self._decode_ancillary_data(ancillary_hex)
+        # Field matching is case-insensitive and tokens are lowercase, so
+        # lowercase once here rather than in every _tokenize call
+        ancillary_lower = ancillary_text.lower()
+        # Topics and keywords both work from the title/description fields
+        title_text = self._extract_field_value(ancillary_lower, "title")
+        description_text = self._extract_field_value(ancillary_lower, "description")
+        content = (
+            ancillary_text.strip(),
+            tuple(self._detect_topics(ancillary_lower, title_text, description_text)),
+            tuple(self._extract_keywords(ancillary_lower, title_text, description_text)),
         )
+        cache[ancillary_hex] = content
+        if len(cache) > CONTENT_CACHE_SIZE:
+            cache.popitem(last=False)
+        return content
 
     @staticmethod
     def _normalize_arguments(arguments: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -278,71 +346,89 @@ class QuestionAnalyzer:
             value_obj = argument.get("Value") or {}
             if not name:
                 continue
-            normalized[name] = (
-                value_obj.get("string")
-                or value_obj.get("hex")
-                or value_obj.get("bigInteger")
-                or value_obj.get("integer")
-                or value_obj.get("address")
-                or value_obj.get("bool")
-            )
+            # First truthy value in priority order, else the last key's value
+            # (the same result as chaining the lookups with ``or``)
+            value = None
+            if value_obj:
+                for key in _ARGUMENT_VALUE_KEYS:
+                    value = value_obj.get(key)
+                    if value:
+                        break
+            normalized[name] = value
         return normalized
 
     @staticmethod
     def _decode_ancillary_data(hex_value: str) -> str:
-        """Decode ancillaryData hex payloads into UTF-8 text."""
+        """Decode ancillaryData hex payloads into UTF-8 text.
+
+        Repeated payloads are answered by ``_analyze_content``'s cache.
+        """
         if not hex_value:
             return ""
         value = hex_value[2:] if hex_value.startswith("0x") else hex_value
         try:
-            return bytes.fromhex(value).decode("utf-8", errors="replace")
+            # unhexlify is the faster path; fromhex also accepts spaced hex
+            try:
+                raw = binascii.unhexlify(value)
+            except binascii.Error:
+                raw = bytes.fromhex(value)
+            return raw.decode("utf-8", errors="replace")
         except ValueError:
             # Already plain-text or non-hex data
             return hex_value
 
     @staticmethod
+    @lru_cache(maxsize=8192)
     def _parse_time(value: Optional[str]) -> Optional[datetime]:
         if not value:
             return None
         try:
-            if value.endswith("Z"):
-                value = value.replace("Z", "+00:00")
+            if not _FROMISOFORMAT_ACCEPTS_Z and value.endswith("Z"):
+                value = value[:-1] + "+00:00"
             return datetime.fromisoformat(value)
         except ValueError:
             return None
 
-    def _extract_keywords(self, text: str) -> List[str]:
-        title_text = self._extract_field_value(text, "title")
-        description_text = self._extract_field_value(text, "description")
-        counts: Counter[str] = Counter()
-
-        for token in self._tokenize(title_text):
-            if token not in self._STOPWORDS and len(token) > 2:
-                counts[token] += 3  # elevate teams, assets, or events in the title
+    def _extract_keywords(self, text: str, title_text: str, description_text: str) -> List[str]:
+        stopwords = self._STOPWORDS
+        tokenize = self._tokenize
+        counts: Counter[str] = Counter(
+            token
+            for token in tokenize(title_text)
+            if token not in stopwords and len(token) > 2
+        )
+        for token in counts:
+            counts[token] *= 3  # elevate teams, assets, or events in the title
 
-        for token in self._tokenize(description_text):
-            if token not in self._STOPWORDS and len(token) > 2:
-                counts[token] += 1
+        counts.update(
+            token
+            for token in tokenize(description_text)
+            if token not in stopwords and len(token) > 2
+        )
 
         if not counts:
-            for token in self._tokenize(text):
-                if token not in self._STOPWORDS and len(token) > 2:
-                    counts[token] += 1
+            counts.update(
+                token
+                for token in tokenize(text)
+                if token not in stopwords and len(token) > 2
+            )
 
         if not counts:
             return []
 
         return [word for word, _ in counts.most_common(self.max_keywords)]
 
-    def _detect_topics(self, text: str) -> List[str]:
-        core_text = self._extract_core_text(text)
-        tokens = set(self._tokenize(core_text))
+    def _detect_topics(self, text: str, title_text: str, description_text: str) -> List[str]:
+        core_text = self._extract_core_text(text, title_text, description_text)
+        keyword_topics = self._KEYWORD_TOPICS
+        scores = [0] * len(self._TOPIC_NAMES)
+        for token in set(self._tokenize(core_text)):
+            for position in keyword_topics.get(token, ()):
+                scores[position] += 1
 
-        scored_topics: List[str] = []
-        for topic, keywords in self._TOPIC_KEYWORDS.items():
-            score = sum(1 for keyword in keywords if keyword in tokens)
-            if score:
-                scored_topics.append((topic, score))
+        scored_topics = [
+            (topic, score) for topic, score in zip(self._TOPIC_NAMES, scores) if score
+        ]
 
         if not scored_topics:
             return ["General"]
@@ -359,22 +445,16 @@ class QuestionAnalyzer:
             return ""
         return " ".join(match.group("value").split())
 
-    def _extract_core_text(self, text: str) -> str:
-        parts = [
-            part
-            for part in (
-                self._extract_field_value(text, "title"),
-                self._extract_field_value(text, "description"),
-            )
-            if part
-        ]
+    def _extract_core_text(self, text: str, title_text: str, description_text: str) -> str:
+        parts = [part for part in (title_text, description_text) if part]
         if parts:
             return " ".join(parts)
         return " ".join(text.split())
 
     def _tokenize(self, text: str) -> List[str]:
+        """Split already-lowercased text into word tokens."""
         if not text:
             return []
-        return self._WORD_PATTERN.findall(text.lower())
+        return self._WORD_PATTERN.findall(text)
 
 